@@ -0,0 +1,124 @@
+"""
+Run the dispatch benchmarks and compare them against a stored baseline.
+
+    python -m benchmarks run [--output results.json] [--case NAME ...]
+    python -m benchmarks compare benchmarks/baseline.json [results.json] [--threshold 0.25]
+
+`compare` runs the benchmarks itself if no results are given and exits with status 1 if
+any case is slower than the baseline by more than `threshold` (relative). Every run also
+times a plain method call as reference, the cases are compared by their time relative to
+the reference of their own run, which cancels out most of the speed of the machine and
+the interpreter.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks.cases import CASES, Skip
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+class Reference:
+    def compute(self, x):
+        return x
+
+
+def reference():
+    """A method call without overloads, the unit the cases are compared in."""
+    instance = Reference()
+    return lambda: instance.compute(1)
+
+
+def measure(stmt, repeat: int, min_time: float) -> float:
+    """Best time per call in nanoseconds over `repeat` runs of at least `min_time` seconds."""
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(names: list[str], repeat: int, min_time: float) -> dict:
+    results = {}
+    ref = measure(reference(), repeat, min_time)
+    print(f"{'(reference)':<24} {ref:>14,.0f} ns")
+    for name in names:
+        try:
+            stmt = CASES[name]()
+        except Skip as err:
+            print(f"{name:<24} skipped ({err})")
+            continue
+        results[name] = measure(stmt, repeat, min_time)
+        print(f"{name:<24} {results[name]:>14,.0f} ns")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "reference": ref,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """
+    Print the relative change per case, False if any case regressed beyond `threshold`.
+
+    Results with a reference are compared in multiples of it, older ones in nanoseconds.
+    """
+    if baseline.get("python") != current.get("python"):
+        print(f"note: baseline was taken with Python {baseline.get('python')}")
+    base_ref, current_ref = baseline.get("reference"), current.get("reference")
+    if base_ref is None or current_ref is None:
+        print("note: no reference timing, comparing absolute timings")
+        base_ref = current_ref = 1.0
+    ok = True
+    for name, base in baseline["results"].items():
+        if (value := current["results"].get(name)) is None:
+            print(f"{name:<24} {base:>14,.0f} ns {'skipped':>17}")
+            continue
+        change = (value / current_ref) / (base / base_ref) - 1
+        regressed = change > threshold
+        ok = ok and not regressed
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:<24} {base:>14,.0f} ns {value:>14,.0f} ns {change:>+8.1%} {marker}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), dest="cases")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", type=Path, help="write the results as JSON")
+    compare_parser = commands.add_parser("compare", help="fail on regressions")
+    compare_parser.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("results", type=Path, nargs="?")
+    compare_parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    names = args.cases or list(CASES)
+    if args.command == "run":
+        results = run(names, args.repeat, args.min_time)
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    baseline["results"] = {
+        name: value for name, value in baseline["results"].items() if name in names
+    }
+    if args.results:
+        current = json.loads(args.results.read_text())
+    else:
+        current = run(names, args.repeat, args.min_time)
+        print()
+    return 0 if compare(baseline, current, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Dispatch benchmarks, each case returns the callable which is timed.
+
+Cases which need an optional dependency (e.g. Pydantic) or a feature the installed
+`strongtyping` doesn't support raise `Skip` while setting up.
+"""
+
+from typing import Annotated, Callable
+
+from strongtyping_pyoverload import overload
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+class Skip(Exception):
+    pass
+
+
+def case(func):
+    CASES[func.__name__] = func
+    return func
+
+
+class Service:
+    @overload
+    def compute(self, x: int):
+        return x
+
+    @overload
+    def compute(self, x: str):
+        return x
+
+
+@case
+def cold_first_call():
+    """Registration of two overloads and their first call."""
+
+    def run():
+        class Cold:
+            @overload
+            def compute(self, x: int):
+                return x
+
+            @overload
+            def compute(self, x: str):
+                return x
+
+        return Cold().compute(1)
+
+    return run
+
+
+@case
+def warm_hit():
+    service = Service()
+    service.compute(1)
+    return lambda: service.compute(1)
+
+
+@case
+def miss_across_overloads():
+    """Full resolution through 20 overloads, the last one matches."""
+    namespace = {"overload": overload}
+    source = "class Many:\n" + "".join(
+        f"    @overload\n    def compute(self, x: int, y: {name}):\n        return y\n"
+        for name in [f"T{idx}" for idx in range(19)] + ["str"]
+    )
+    namespace.update({f"T{idx}": type(f"T{idx}", (), {}) for idx in range(19)})
+    exec(source, namespace)
+    many = namespace["Many"]()
+    dispatch_cache = namespace["Many"].compute.dispatch_cache_
+
+    def run():
+        dispatch_cache.clear()
+        return many.compute(1, "a")
+
+    return run
+
+
+@case
+def deep_mro():
+    """Overloads spread over a 10 level hierarchy, called on the leaf class."""
+
+    class Level0:
+        @overload
+        def compute(self, x: int):
+            return x
+
+    cls = Level0
+    for idx in range(1, 10):
+
+        @overload
+        def compute(self, x: bytes):
+            return x
+
+        cls = type(f"Level{idx}", (cls,), {"compute": compute, "__module__": __name__})
+    leaf = cls()
+    leaf.compute(1)
+    return lambda: leaf.compute(1)
+
+
+@case
+def var_arguments():
+    class Variadic:
+        @overload
+        def compute(self, x: str, y: str):
+            return x
+
+        @overload
+        def compute(self, *args, **kwargs):
+            return args
+
+    variadic = Variadic()
+    return lambda: variadic.compute(1, 2, 3, key="value")
+
+
+@case
+def pydantic_models():
+    """A dict dispatched to the last of five models."""
+    try:
+        from pydantic import BaseModel
+    except ImportError:
+        raise Skip("pydantic is not installed")
+
+    models = [
+        type(f"Model{idx}", (BaseModel,), {"__annotations__": {f"field{idx}": int}})
+        for idx in range(5)
+    ]
+    namespace = {"overload": overload, **{model.__name__: model for model in models}}
+    source = "class Api:\n" + "".join(
+        f"    @overload\n    def handle(self, data: Model{idx}):\n        return data\n"
+        for idx in range(5)
+    )
+    exec(source, namespace)
+    api = namespace["Api"]()
+    payload = {"field4": 1}
+    api.handle(payload)
+    return lambda: api.handle(payload)
+
+
+@case
+def annotated_guards():
+    class Guarded:
+        @overload
+        def compute(self, x: Annotated[int, lambda val: val > 0]):
+            return "positive"
+
+        @overload
+        def compute(self, x: Annotated[int, lambda val: val < 0]):
+            return "negative"
+
+        @overload
+        def compute(self, x: int):
+            return "zero"
+
+    guarded = Guarded()
+    try:
+        result = guarded.compute(-1)
+    except Exception as err:
+        raise Skip(f"Annotated guards are not supported: {err!r}")
+    if result != "negative":
+        raise Skip("Annotated guards are not supported by the installed strongtyping")
+    return lambda: guarded.compute(-1)
+
+
+@case
+def large_container():
+    class Containers:
+        @overload
+        def compute(self, values: list[str]):
+            return values
+
+        @overload
+        def compute(self, values: list[int]):
+            return values
+
+    containers = Containers()
+    values = list(range(100_000))
+    containers.compute(values)
+    return lambda: containers.compute(values)
+
+
+@overload
+def module_function(x: int):
+    return x
+
+
+@overload
+def module_function(x: str):
+    return x
+
+
+@case
+def module_level():
+    module_function(1)
+    return lambda: module_function(1)
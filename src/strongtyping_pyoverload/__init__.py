@@ -6,3 +6,4 @@
 """
 
 from .class_tools import overload as overload
+from .class_tools import prime as prime
@@ -1,211 +1,1023 @@
+import asyncio
+import concurrent.futures
 import inspect
+import os
 import pprint
+import threading
+import time
 import typing
-from collections import defaultdict
-from functools import wraps
-from types import MethodType
+import weakref
+from functools import cached_property, partial, update_wrapper
+from types import MethodType, ModuleType, NoneType
 
 import itertools
-from strongtyping.cached_dict import CachedDict
 
+from strongtyping_pyoverload import instrumentation
+from strongtyping_pyoverload.container_check import ContainerCheck
 from strongtyping_pyoverload.exception import InvalidOverloadException
-from strongtyping_pyoverload.func_info import FuncInfo
+from strongtyping_pyoverload.func_info import PYDANTIC_INSTALLED as PYDANTIC_INSTALLED
+from strongtyping_pyoverload.func_info import FuncInfo, rank_by_specificity, union_members
+from strongtyping_pyoverload.instrumentation import DispatchStats, Hooks
+from strongtyping_pyoverload.overload_check import check_registration
+from strongtyping_pyoverload.overload_index import OverloadIndex
+from strongtyping_pyoverload.result_cache import MISSING, CacheInfo, ResultCache
 
-try:
-    from pydantic import BaseModel, ValidationError
-except (ModuleNotFoundError, ImportError):
-    PYDANTIC_INSTALLED = False
-else:
-    PYDANTIC_INSTALLED = True
 
-__override_items__ = defaultdict(list)
-ANY = object()
-IGNORE_CHARS = "<function "
-START_IDX = len(IGNORE_CHARS)
+class OverloadList(list):
+    """All overloads of one name in one namespace, referenced weakly by the registry."""
 
+    __slots__ = ("__weakref__",)
 
-def generate_parameter_infos(func: MethodType):
+
+# (module, qualified name of the owner, function name) -> OverloadList, the lists are kept
+# alive by their OverloadDispatcher so they vanish together with their class
+__override_items__: "weakref.WeakValueDictionary[tuple[str, str, str], OverloadList]" = (
+    weakref.WeakValueDictionary()
+)
+# same key -> OverloadDispatcher which still collects overloads, classes remove their
+# dispatchers once they are created so a new class with the same name starts from scratch
+__dispatchers__: "weakref.WeakValueDictionary[tuple[str, str, str], OverloadDispatcher]" = (
+    weakref.WeakValueDictionary()
+)
+# upper bound of cached dispatch decisions per dispatcher, the cache starts over when reached
+DISPATCH_CACHE_SIZE = 1024
+# serializes `FuncInfo.prepare` of lazily registered overloads between threads
+PREPARE_LOCK = threading.RLock()
+# default of `overload(lazy=...)`
+LAZY_REGISTRATION = os.environ.get("STRONGTYPING_PYOVERLOAD_LAZY", "") not in ("", "0")
+
+
+def resolve_annotations(func, owner: type | None = None) -> tuple[dict, bool]:
+    """
+    The annotations of `func` with strings and forward references evaluated against its
+    globals and the namespace of its `owner` class, or the raw annotations and `False`
+    if they can't be resolved (yet).
+    """
+    localns = None if owner is None else {**vars(owner), owner.__name__: owner}
+    try:
+        return typing.get_type_hints(func, localns=localns, include_extras=True), True
+    except Exception:
+        return dict(func.__annotations__), False
+
+
+def namespace_state(func, owner: type | None = None) -> tuple[int, int]:
+    """
+    Changes whenever a name is added to the namespaces `resolve_annotations` looks in,
+    annotations which failed to resolve are only retried after that.
+    """
+    return len(func.__globals__), -1 if owner is None else len(vars(owner))
+
+
+def generate_parameter_infos(func: MethodType, annotations: dict | None = None):
     params = inspect.signature(func).parameters
-    annotations = func.__annotations__
+    if annotations is None:
+        annotations = resolve_annotations(func)[0]
     func_params = {
-        val.name: (typing.Any, val.kind.name, val.name)
+        val.name: (typing.Any, val.kind.name, val.name, val.default is not inspect.Parameter.empty)
         for key, val in params.items()
         if val.name != "self"
     }
     for key, val in annotations.items():
         if elem := func_params.get(key):
-            func_params[key] = (val, elem[1], elem[2])
+            func_params[key] = (val, *elem[1:])
     return func_params.values()
 
 
-def generate_docstring(lookup_key: tuple[str, str]):
-    return "\n".join(
-        obj.func_.__doc__ for obj in __override_items__[lookup_key] if obj.func_.__doc__
-    )
+def prepare_overloads(
+    overloads: typing.Iterable[FuncInfo], owner: type | None = None
+) -> list[FuncInfo]:
+    """
+    Introspect the parameters of overloads which were registered lazily or whose
+    annotations couldn't be resolved so far, returns the ones resolved by this call.
+
+    Annotations which failed to resolve are retried once a name was defined since.
+    """
+    resolved = []
+    for info in overloads:
+        if info.annotations_resolved_:
+            continue
+        if info.resolve_state_ is not None and info.resolve_state_ == namespace_state(
+            info.func_, owner
+        ):
+            continue
+        with PREPARE_LOCK:
+            # prepared by another thread meanwhile
+            if not info.annotations_resolved_:
+                state = namespace_state(info.func_, owner)
+                annotations, annotations_resolved = resolve_annotations(info.func_, owner)
+                info.prepare(
+                    generate_parameter_infos(info.func_, annotations), annotations_resolved
+                )
+                if annotations_resolved:
+                    resolved.append(info)
+                else:
+                    info.resolve_state_ = state
+    return resolved
 
 
-def find_corresponding_func(
-    func_name, cls_name: str | list[str], args: tuple, kwargs: dict
-) -> FuncInfo | None:
-    pos_or_kwarg_funcs = []
-    if isinstance(cls_name, str):
-        data = __override_items__[(cls_name, func_name)]
-    else:
-        data = itertools.chain.from_iterable(
-            [
-                __override_items__[(cls_name_, func_name)]
-                for cls_name_ in cls_name
-                if cls_name_ != "object"
-            ]
-        )
+def prepare_namespace(overloads: list[FuncInfo], owner: type | None = None):
+    """
+    `prepare_overloads` for all overloads of one namespace, the ones resolved now are
+    checked for conflicts, which was skipped at their registration.
+    """
+    if not (resolved := prepare_overloads(overloads, owner)):
+        return
+    resolved_ids = {id(info) for info in resolved}
+    checked = [
+        info for info in overloads if info.annotations_resolved_ and id(info) not in resolved_ids
+    ]
+    for info in resolved:
+        check_registration(info, checked)
+        checked.append(info)
 
-    for info in data:
+
+def rank_overloads(overloads: list[FuncInfo], owner: type | None = None) -> list[FuncInfo]:
+    """
+    The overloads of one namespace ordered by their specificity, overloads which are
+    equally specific keep the order of their registration.
+    """
+    prepare_namespace(overloads, owner)
+    return rank_by_specificity(overloads)
+
+
+def generate_docstring(overloads: list[FuncInfo]):
+    return "\n".join(obj.func_.__doc__ for obj in overloads if obj.func_.__doc__)
+
+
+def resolve_in_index(
+    index: OverloadIndex,
+    args: tuple,
+    kwargs: dict,
+    by_type: bool = False,
+    stats: DispatchStats | None = None,
+):
+    """
+    The first matching overload and whether the decision may be cached by argument types,
+    which holds if the overload and every candidate rejected before it are decided by types.
+
+    With `by_type` the arguments are the types of the call arguments, which can only be
+    decided if every checked candidate is type determined.
+    """
+    pos_or_kwarg_funcs = []
+    cacheable = True
+    for info in index.candidates(len(args), kwargs):
         if info.is_keyword_only:
-            if info == kwargs:
-                return info
+            if stats is not None:
+                stats.candidates_checked += 1
+            if info.match_types(kwargs) if by_type else info == kwargs:
+                return info, cacheable and info.type_determined_, None
+            cacheable = cacheable and info.rejected_by_type(kwargs, by_type)
         elif info.is_positional_only:
-            if info == args:
-                return info
+            if stats is not None:
+                stats.candidates_checked += 1
+            if info.match_types(args) if by_type else info == args:
+                return info, cacheable and info.type_determined_, None
+            cacheable = cacheable and info.rejected_by_type(args, by_type)
         elif info.no_parameter and not args and not kwargs:
-            return info
+            return info, cacheable, None
         else:
             pos_or_kwarg_funcs.append(info)
+    group_key = group_matches = None
     for info in pos_or_kwarg_funcs:
-        if PYDANTIC_INSTALLED:
-            res = check_pydantic_model(info, args, kwargs)
-            if res is not None and res:
-                return info
-        if info == (args, kwargs):
-            return info
-    return None
-
-
-def check_pydantic_model(func_info, args, kwargs) -> bool | None:
-    if not PYDANTIC_INSTALLED:
-        return False
-    is_valid = True
-    if any(
-        isinstance(param[0], type) and issubclass(param[0], BaseModel)
-        for param in func_info.params_
-    ):
-        for idx, param in enumerate(func_info.params_):
-            annotation = param[0]
-            try:
-                if isinstance(annotation, type) and issubclass(annotation, BaseModel):
-                    if args and idx < len(args):
-                        model = annotation.model_validate(args[idx])
-                    else:
-                        model = annotation.model_validate(kwargs[param[2]])
-                else:
-                    continue
-            except (AttributeError, TypeError, ValidationError):
-                return False
+        if stats is not None:
+            stats.candidates_checked += 1
+        if by_type:
+            if info.match_types((args, kwargs)):
+                return info, cacheable and info.type_determined_, None
+        elif info.pydantic_params_:
+            if stats is None:
+                call = validate_pydantic_args(info, args, kwargs)
             else:
-                if args:
-                    func_info.pydantic_params_.append((idx, model))
-                else:
-                    func_info.pydantic_kwargs_.append(model)
-    else:
-        return None
-    return is_valid
+                start = time.perf_counter_ns()
+                call = validate_pydantic_args(info, args, kwargs)
+                stats.validation_time_ns += time.perf_counter_ns() - start
+            if call is not None:
+                return info, cacheable and info.type_determined_, call
+        else:
+            # consecutive overloads which only differ in `Annotated` guards share the check
+            # of the base types
+            if info.base_key_ != group_key:
+                group_key = info.base_key_
+                group_matches = info.base_matcher_((args, kwargs))
+            if group_matches:
+                if info.guard_matcher_ is None or info.guard_matcher_((args, kwargs)):
+                    return info, cacheable and info.type_determined_, None
+                # the base types match, the guards rejected the values
+                cacheable = False
+                continue
+        # a candidate which fails on the values, not on their types, depends on the values
+        cacheable = cacheable and info.rejected_by_type((args, kwargs), by_type)
+    return None, cacheable, None
+
 
+def declared_signatures(func_info: FuncInfo):
+    """
+    The argument types of every call `func_info` accepts by its annotations alone,
+    positional parameters as types and keyword-only ones as a dict of types.
+
+    Nothing is yielded for overloads taking `*args`/`**kwargs` or parameters annotated with
+    anything but classes and unions of classes.
+    """
+    if not func_info.type_determined_ or func_info.contains_args_ or func_info.contains_kwargs_:
+        return
+    choices = []
+    for annotation, *_ in func_info.params_:
+        members = union_members(annotation) or (annotation,)
+        if typing.Any in members or object in members:
+            return
+        choices.append(tuple(NoneType if member is None else member for member in members))
+    kinds = [param[1] for param in func_info.params_]
+    names = [param[2] for param in func_info.params_]
+    for combination in itertools.product(*choices):
+        yield (
+            tuple(type_ for type_, kind in zip(combination, kinds) if kind != "KEYWORD_ONLY"),
+            {
+                name: type_
+                for type_, kind, name in zip(combination, kinds, names)
+                if kind == "KEYWORD_ONLY"
+            },
+        )
+
+
+class ValidatedCall(typing.NamedTuple):
+    """The arguments of one call with Pydantic models in place of the raw values."""
+
+    args: tuple
+    kwargs: dict
 
-def is_module(func_, cls_):
-    return cls_.__class__.__name__ in func_.__qualname__
 
+def validate_pydantic_args(func_info: FuncInfo, args: tuple, kwargs: dict) -> ValidatedCall | None:
+    """
+    Validate the arguments for the Pydantic model parameters of `func_info` and type check
+    the remaining ones, `None` if they don't match.
 
-def handle_error(is_module_function, func_class_name, cls_, args, kwargs, /):
-    if is_module_function:
-        info = pprint.pformat(args) if cls_ or args else pprint.pformat(kwargs)
+    The models only live in the returned `ValidatedCall`, so concurrent calls share no state.
+    """
+    arg_values = list(args)
+    kwarg_values = dict(kwargs)
+    for idx, name, validate in func_info.pydantic_params_:
+        if idx < len(args):
+            if (model := validate(args[idx])) is None:
+                return None
+            arg_values[idx] = model
+        elif name in kwargs:
+            if (model := validate(kwargs[name])) is None:
+                return None
+            kwarg_values[name] = model
+    call = ValidatedCall(tuple(arg_values), kwarg_values)
+    if not func_info.validated_matcher_(call.args, call.kwargs):
+        return None
+    return call
+
+
+def handle_error(is_method, func_class_name, cls_, args, kwargs, /):
+    info = pprint.pformat(args) if args else pprint.pformat(kwargs)
+    if is_method:
         raise InvalidOverloadException(
             f"`{func_class_name}` has no function which matches with your parameters `{info}`"
         )
-    else:
-        info = pprint.pformat((cls_, *args)) if cls_ or args else pprint.pformat(kwargs)
-        raise InvalidOverloadException(
-            f"No function was found which matches your parameters `{info}`"
-        )
+    raise InvalidOverloadException(f"No function was found which matches your parameters `{info}`")
 
 
-def generate_annotations(lookup_key):
-    data = __override_items__[lookup_key]
-    res = data[0].func_.__annotations__
-    for obj in data[1:]:
+def generate_annotations(overloads: list[FuncInfo]):
+    """Annotations of all overloads, names annotated differently get the `Union` of them."""
+    merged = {}
+    for obj in overloads:
         for key, val in obj.func_.__annotations__.items():
-            try:
-                res[key] = set([*res[key], val])
-            except TypeError:
-                res[key] = set([res[key], val])
-            except KeyError:
-                res[key] = val
-    for key, val in res.items():
+            values = merged.setdefault(key, [])
+            if val not in values:
+                values.append(val)
+    res = {}
+    for key, values in merged.items():
         try:
-            if len(val) > 1:
-                res[key] = typing.Union[*val]
+            res[key] = values[0] if len(values) == 1 else typing.Union[*values]
         except TypeError:
-            continue
+            res[key] = tuple(values)
     return res
 
 
-def overload(func):
-    func_info = FuncInfo(func, generate_parameter_infos(func))
-    __override_items__[func_info.lookup_key].append(func_info)
-    cached_dict = CachedDict()
+def call_func(func_info: FuncInfo, cls_, args: tuple, kwargs: dict):
+    if cls_ is None:
+        return func_info.func_(*args, **kwargs)
+    return func_info.func_(cls_, *args, **kwargs)
 
-    @wraps(func)
-    def inner(cls_=None, *args, **kwargs):
-        is_module_function = is_module(func, cls_) if cls_ is not None else False
-        func_class_name = FuncInfo.extract_class_name_from_func(func)
-        if is_module_function:
-            cached_key = f"{func.__name__}_{func_class_name}_{args}_{kwargs}"
-        else:
-            cached_key = f"{func.__name__}_{func_class_name}_{(cls_, *args)}_{kwargs}"
-        if cached_result := cached_dict.get(cached_key):
-            return cached_result
 
+def memo_key(cls_, args: tuple, kwargs: dict) -> tuple:
+    """Key of a memoized result, with the argument types as `1`, `1.0` and `True` are equal."""
+    return (
+        cls_,
+        args,
+        tuple(map(type, args)),
+        tuple(sorted((name, type(value), value) for name, value in kwargs.items())),
+    )
+
+
+def call_memoized(func_info: FuncInfo, cls_, args: tuple, kwargs: dict):
+    if func_info.is_coroutine_:
+        return call_memoized_async(func_info, cls_, args, kwargs)
+    result_cache = func_info.result_cache_
+    key = memo_key(cls_, args, kwargs)
+    try:
+        result = result_cache.get(key)
+    except TypeError:
+        # unhashable arguments are never memoized
+        return call_func(func_info, cls_, args, kwargs)
+    if result is MISSING:
+        result = call_func(func_info, cls_, args, kwargs)
+        result_cache.set(key, result)
+    return result
+
+
+async def call_memoized_async(func_info: FuncInfo, cls_, args: tuple, kwargs: dict):
+    """`call_memoized` for `async def` overloads, the awaited result is stored, not the coroutine."""
+    result_cache = func_info.result_cache_
+    key = memo_key(cls_, args, kwargs)
+    try:
+        result = result_cache.get(key)
+    except TypeError:
+        return await call_func(func_info, cls_, args, kwargs)
+    if result is MISSING:
+        # concurrent calls with the same arguments may run before the first one is stored
+        result = await call_func(func_info, cls_, args, kwargs)
+        result_cache.set(key, result)
+    return result
+
+
+def call_chunk(dispatcher: "OverloadDispatcher", position: int | None, receiver, items: list):
+    """Run in the workers of `parallel_map`, `position` is the overload resolved for `items`."""
+    if position is None:
+        return [dispatcher.dispatch(receiver, (item,), {}) for item in items]
+    func = dispatcher.overloads_[position].func_
+    if receiver is None:
+        return [func(item) for item in items]
+    return [func(receiver, item) for item in items]
+
+
+def memoized_cache_info(overloads: list[FuncInfo]) -> CacheInfo:
+    caches = [info.result_cache_ for info in overloads if info.result_cache_ is not None]
+    maxsizes = [cache.maxsize for cache in caches]
+    return CacheInfo(
+        hits=sum(cache.hits for cache in caches),
+        misses=sum(cache.misses for cache in caches),
+        maxsize=None if None in maxsizes else sum(maxsizes),
+        currsize=sum(len(cache) for cache in caches),
+    )
+
+
+def memoized_cache_clear(overloads: list[FuncInfo]):
+    for info in overloads:
+        if info.result_cache_ is not None:
+            info.result_cache_.clear()
+
+
+def overload(
+    func=None,
+    /,
+    *,
+    memoize: bool = False,
+    maxsize: int | None = 128,
+    ttl: float | None = None,
+    container_check: ContainerCheck | None = None,
+    lazy: bool | None = None,
+):
+    """
+    Register `func` as one overload of its name.
+
+    With `memoize=True` the results of this overload are kept in a LRU cache of `maxsize`
+    entries which expire after `ttl` seconds, keyed by the (hashable) call arguments.
+    `container_check` defines how many elements of container arguments are checked,
+    by default the global strategy of `set_container_check` (first element only) is used.
+    With `lazy=True` the parameters are only introspected on the first dispatch, the default
+    is taken from the environment variable `STRONGTYPING_PYOVERLOAD_LAZY`.
+    """
+    if func is None:
+        return partial(
+            overload,
+            memoize=memoize,
+            maxsize=maxsize,
+            ttl=ttl,
+            container_check=container_check,
+            lazy=lazy,
+        )
+
+    if lazy is None:
+        lazy = LAZY_REGISTRATION
+    func_info = FuncInfo(
+        func,
+        None,
+        ResultCache(maxsize, ttl) if memoize else None,
+        container_check,
+    )
+    if not lazy:
+        prepare_overloads((func_info,))
+    if (dispatcher := __dispatchers__.get(func_info.lookup_key)) is None:
+        dispatcher = __dispatchers__[func_info.lookup_key] = OverloadDispatcher(func)
+    dispatcher.register(func_info)
+    return dispatcher
+
+
+class OverloadDispatcher:
+    """
+    Takes the place of all overloads of one name in one namespace.
+
+    Accessing it on an instance binds it once to that instance (see `BoundDispatcher`),
+    calls are dispatched with the instance as receiver through the overloads of the
+    receiver class and its bases in MRO order.
+    """
+
+    def __init__(self, func):
+        # the merged `__doc__`/`__annotations__`/`__signature__` are generated on first access
+        update_wrapper(self, func, assigned=("__module__", "__name__", "__qualname__"))
+        self.owner_ = None
+        self.lookup_key_ = (*FuncInfo.extract_owner_from_func(func), func.__name__)
+        self.overloads_ = OverloadList()
+        # (receiver class, *argument types, *(keyword, type)) -> FuncInfo
+        self.dispatch_cache_: dict[tuple, FuncInfo] = {}
+        # (receiver class, argument type) -> function of overload sets which are dispatched on
+        # the type of a single argument (see `OverloadIndex.single_dispatch`)
+        self.single_dispatch_: dict[tuple[type, type], typing.Callable] = {}
+        # receiver class -> overloads visible for it in MRO order, weak so subclasses (e.g. of
+        # plugins) can be collected, the dispatch caches above only hold them until they start over
+        self.receiver_index_: "weakref.WeakKeyDictionary[type, OverloadIndex]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def register(self, func_info: FuncInfo):
+        if self.overloads_ and func_info.is_coroutine_ != self.is_coroutine:
+            raise InvalidOverloadException(
+                f"`{func_info.func_.__qualname__}` can't mix `async def` and plain overloads"
+            )
+        check_registration(func_info, self.overloads_)
+        self.overloads_.append(func_info)
+        if func_info.is_coroutine_ and hasattr(inspect, "markcoroutinefunction"):
+            # `inspect.iscoroutinefunction` (used by e.g. aiohttp for its handlers) is true for
+            # the dispatcher and its bound methods, calls return the coroutine of the overload
+            inspect.markcoroutinefunction(self)
+        __override_items__[self.lookup_key_] = self.overloads_
+        self.dispatch_cache_.clear()
+        self.single_dispatch_.clear()
+        self.receiver_index_.clear()
+        for name in ("__doc__", "__annotations__", "__signature__"):
+            vars(self).pop(name, None)
+
+    @cached_property
+    def __doc__(self):
+        return generate_docstring(self.overloads_)
+
+    @cached_property
+    def __annotations__(self):
+        return generate_annotations(self.overloads_)
+
+    @cached_property
+    def __signature__(self):
+        return generate_signature(self.overloads_, self.__annotations__)
+
+    @property
+    def overloads(self) -> tuple:
+        return tuple(info.func_ for info in self.overloads_)
+
+    @property
+    def is_coroutine(self) -> bool:
+        """True if the overloads are `async def` functions, a set can't mix both kinds."""
+        return bool(self.overloads_) and self.overloads_[0].is_coroutine_
+
+    def __set_name__(self, owner, name):
+        self.owner_ = owner
+        if __dispatchers__.get(self.lookup_key_) is self:
+            del __dispatchers__[self.lookup_key_]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return BoundDispatcher(self, instance)
+
+    def __call__(self, *args, **kwargs):
+        if self.owner_ is None:
+            return self.dispatch(None, args, kwargs)
+        # accessed through the class, the receiver is passed explicitly
+        if not args:
+            handle_error(True, self.owner_.__name__, None, args, kwargs)
+        return self.dispatch(args[0], args[1:], kwargs)
+
+    def __repr__(self):
+        return f"<overloaded function {self.__qualname__} ({len(self.overloads_)} overloads)>"
+
+    def __reduce__(self):
+        # pickled by reference like a plain function, found by module and qualified name
+        return self.__qualname__
+
+    def dispatch(self, receiver, args: tuple, kwargs: dict):
+        if instrumentation.active is not None:
+            return self.dispatch_instrumented(instrumentation.active, receiver, args, kwargs)
+        # argument types are followed by (keyword, type) pairs, which can't be mistaken for types
+        if kwargs:
+            dispatch_key = (
+                type(receiver),
+                *map(type, args),
+                *[(name, type(kwargs[name])) for name in sorted(kwargs)],
+            )
+        elif len(args) == 1:
+            dispatch_key = (type(receiver), type(args[0]))
+            if (func := self.single_dispatch_.get(dispatch_key)) is not None:
+                try:
+                    if receiver is None:
+                        return func(args[0])
+                    return func(receiver, args[0])
+                except KeyError:
+                    handle_error(self.owner_ is not None, self.__qualname__, receiver, args, kwargs)
+        else:
+            dispatch_key = (type(receiver), *map(type, args))
+        if (func_info := self.dispatch_cache_.get(dispatch_key)) is None:
+            func_info, call = self.resolve(receiver, args, kwargs, dispatch_key)
+            if call is not None:
+                args, kwargs = call
         try:
-            class_names = [func_class_name]
-            for obj in cls_.__class__.__mro__:
-                if obj.__name__ not in class_names:
-                    class_names.append(obj.__name__)
-        except (AttributeError, TypeError):
-            class_names = func_class_name
-
-        if is_module_function or cls_ is None:
-            func_info = find_corresponding_func(func.__name__, class_names, args, kwargs)
+            if func_info.direct_call_:
+                if receiver is None:
+                    return func_info.func_(*args, **kwargs)
+                return func_info.func_(receiver, *args, **kwargs)
+            return call_memoized(func_info, receiver, args, kwargs)
+        except KeyError:
+            handle_error(self.owner_ is not None, self.__qualname__, receiver, args, kwargs)
+
+    def dispatch_instrumented(self, hooks: Hooks, receiver, args: tuple, kwargs: dict):
+        """`dispatch` which counts into the `DispatchStats` of this dispatcher and calls `hooks`."""
+        stats = instrumentation.stats_for(self)
+        stats.calls += 1
+        if kwargs:
+            dispatch_key = (
+                type(receiver),
+                *map(type, args),
+                *[(name, type(kwargs[name])) for name in sorted(kwargs)],
+            )
+        else:
+            dispatch_key = (type(receiver), *map(type, args))
+        if (func_info := self.dispatch_cache_.get(dispatch_key)) is not None:
+            stats.cache_hits += 1
         else:
-            func_info = find_corresponding_func(func.__name__, class_names, (cls_, *args), kwargs)
-        if not func_info:
+            if hooks.on_miss is not None:
+                hooks.on_miss(self, args, kwargs)
+            start = time.perf_counter_ns()
+            try:
+                func_info, call = self.resolve(receiver, args, kwargs, dispatch_key, stats)
+            except InvalidOverloadException as err:
+                if hooks.on_error is not None:
+                    hooks.on_error(self, args, kwargs, err)
+                raise
+            finally:
+                stats.resolve_time_ns += time.perf_counter_ns() - start
+            if call is not None:
+                args, kwargs = call
+        stats.selected[func_info.func_] += 1
+        if hooks.on_dispatch is not None:
+            hooks.on_dispatch(self, func_info.func_, args, kwargs)
+        try:
+            if func_info.direct_call_:
+                return call_func(func_info, receiver, args, kwargs)
+            return call_memoized(func_info, receiver, args, kwargs)
+        except KeyError:
+            try:
+                handle_error(self.owner_ is not None, self.__qualname__, receiver, args, kwargs)
+            except InvalidOverloadException as err:
+                if hooks.on_error is not None:
+                    hooks.on_error(self, args, kwargs, err)
+                raise
+
+    def resolve(
+        self,
+        receiver,
+        args: tuple,
+        kwargs: dict,
+        dispatch_key: tuple,
+        stats: DispatchStats | None = None,
+    ) -> tuple[FuncInfo, ValidatedCall | None]:
+        func_info, call = self.find_overload(args, kwargs, dispatch_key, stats)
+        if func_info is None:
             raise InvalidOverloadException(
                 f"No function was found which matches your parameters `{args}_{kwargs}`"
             )
+        return func_info, call
+
+    def find_overload(
+        self,
+        args: tuple,
+        kwargs: dict,
+        dispatch_key: tuple,
+        stats: DispatchStats | None = None,
+    ) -> tuple[FuncInfo | None, ValidatedCall | None]:
+        """`resolve` without raising, `None` if no overload matches."""
+        index = self.receiver_index(dispatch_key[0])
+        if index.unresolved:
+            # forward references to names defined after registration, retried once a name
+            # was defined (see `prepare_overloads`)
+            for dispatcher in self.mro_dispatchers(dispatch_key[0]):
+                prepare_namespace(dispatcher.overloads_, dispatcher.owner_)
+            if any(info.annotations_resolved_ for info in index.unresolved):
+                # their specificity changed with the annotations
+                index = self.receiver_index_[dispatch_key[0]] = self.build_index(dispatch_key[0])
+        func_info, cacheable, call = resolve_in_index(index, args, kwargs, stats=stats)
+        if func_info is not None and cacheable:
+            self.cache_decision(dispatch_key, func_info)
+        return func_info, call
+
+    def cache_decision(self, dispatch_key: tuple, func_info: FuncInfo):
+        if len(self.dispatch_cache_) >= DISPATCH_CACHE_SIZE:
+            self.dispatch_cache_.clear()
+            self.single_dispatch_.clear()
+        self.dispatch_cache_[dispatch_key] = func_info
+        # a single positional argument, keyword arguments would be (name, type) pairs
+        if (
+            len(dispatch_key) == 2
+            and isinstance(dispatch_key[1], type)
+            and self.receiver_index(dispatch_key[0]).single_dispatch
+        ):
+            self.single_dispatch_[dispatch_key] = func_info.func_
+
+    def receiver_index(self, receiver_cls: type) -> OverloadIndex:
+        if (index := self.receiver_index_.get(receiver_cls)) is None:
+            index = self.receiver_index_[receiver_cls] = self.build_index(receiver_cls)
+        return index
+
+    def build_index(self, receiver_cls: type) -> OverloadIndex:
+        """
+        Own overloads first, followed by the ones of the receiver class and its bases,
+        the overloads of each class ordered by specificity.
+        """
+        if self.owner_ is None:
+            return OverloadIndex(rank_overloads(self.overloads_))
+        dispatchers = self.mro_dispatchers(receiver_cls)
+        if len({dispatcher.is_coroutine for dispatcher in dispatchers}) > 1:
+            raise InvalidOverloadException(
+                f"`{self.__qualname__}` can't mix `async def` and plain overloads "
+                f"across the bases of {receiver_cls.__name__}"
+            )
+        return OverloadIndex(
+            itertools.chain.from_iterable(
+                rank_overloads(dispatcher.overloads_, dispatcher.owner_)
+                for dispatcher in dispatchers
+            )
+        )
+
+    def mro_dispatchers(self, receiver_cls: type) -> list["OverloadDispatcher"]:
+        """This dispatcher followed by the ones of the same name along the MRO of `receiver_cls`."""
+        dispatchers = [self]
+        if self.owner_ is None:
+            return dispatchers
+        for obj in receiver_cls.__mro__:
+            attr = vars(obj).get(self.__name__)
+            if isinstance(attr, OverloadDispatcher) and attr not in dispatchers:
+                dispatchers.append(attr)
+        return dispatchers
+
+    def warmup(self, *types, **kw_types) -> int:
+        """
+        Resolve the overload for arguments of `types` and keyword arguments of `kw_types`
+        ahead of the first call, without arguments every annotated signature is resolved.
+
+        Accessed through the class the receiver is an instance of the owner class.
+        Returns the number of dispatch decisions which were cached.
+        """
+        return self.warmup_receiver(
+            NoneType if self.owner_ is None else self.owner_, types, kw_types
+        )
+
+    def warmup_receiver(self, receiver_cls: type, types: tuple = (), kw_types: dict | None = None):
+        if types or kw_types:
+            return int(self.prime_types(receiver_cls, types, kw_types or {}, strict=True))
+        return sum(
+            self.prime_types(receiver_cls, arg_types, kwarg_types)
+            for func_info in self.receiver_index(receiver_cls).infos
+            for arg_types, kwarg_types in declared_signatures(func_info)
+        )
+
+    def prime_types(self, receiver_cls: type, types: tuple, kw_types: dict, strict=False) -> bool:
+        index = self.receiver_index(receiver_cls)
+        func_info, cacheable, _ = resolve_in_index(index, types, kw_types, by_type=True)
+        if not cacheable:
+            # the decision depends on the argument values, it's made on every call
+            return False
+        if func_info is None:
+            if strict:
+                raise InvalidOverloadException(
+                    f"No function was found which matches your parameter types `{types}_{kw_types}`"
+                )
+            return False
+        kw_items = sorted(kw_types.items())
+        self.cache_decision((receiver_cls, *types, *kw_items), func_info)
+        return True
+
+    def gather(self, *args) -> typing.Awaitable[list]:
+        """
+        Await the calls of these async overloads with each of `items` as the only argument
+        concurrently, the results are in the order of `items`.
+
+        Dispatch is resolved once per argument type through the dispatch cache. Accessed
+        through the class the receiver is passed first: `Cls.method.gather(receiver, items)`.
+        """
+        if self.owner_ is None:
+            return self.gather_receiver(None, *args)
+        return self.gather_receiver(*args)
+
+    async def gather_receiver(self, receiver, items: typing.Iterable) -> list:
+        if not self.is_coroutine:
+            raise InvalidOverloadException(f"`{self.__qualname__}` has no `async def` overloads")
+        calls = []
         try:
-            arg_values = list(args)
-            for idx, model in func_info.pydantic_params_:
-                arg_values[idx] = model
-            kwarg_values = kwargs | func_info.pydantic_kwargs_
-            if cls_ is None:
-                result = func_info.func_(*arg_values, **kwarg_values)
+            for item in items:
+                calls.append(self.dispatch(receiver, (item,), {}))
+        except BaseException:
+            # nothing is awaited if one of the items has no matching overload
+            for call in calls:
+                call.close()
+            raise
+        return await asyncio.gather(*calls)
+
+    def map(self, *args, ordered: bool = True, batch: bool = False) -> list:
+        """
+        Call with each item of `iterable` as the only argument, the items are grouped by type
+        and the overload of each group is resolved once.
+
+        Without `ordered` the results are returned group by group instead of in the order of
+        the items. With `batch` a group is passed as a whole to an overload taking a list of
+        its type (e.g. `list[int]`), which has to return one result per item.
+        Accessed through the class the receiver is passed first: `Cls.method.map(receiver, items)`.
+        """
+        if self.owner_ is None:
+            return self.map_receiver(None, *args, ordered=ordered, batch=batch)
+        return self.map_receiver(*args, ordered=ordered, batch=batch)
+
+    def imap(self, *args) -> typing.Iterator:
+        """Lazy `map` in the order of the items, the overload is resolved once per item type."""
+        if self.owner_ is None:
+            return self.imap_receiver(None, *args)
+        return self.imap_receiver(*args)
+
+    def map_receiver(
+        self, receiver, iterable: typing.Iterable, ordered: bool = True, batch: bool = False
+    ) -> list:
+        if self.is_coroutine:
+            raise InvalidOverloadException(f"`{self.__qualname__}` is async, use `gather`")
+        items = list(iterable)
+        groups: dict[type, list[int]] = {}
+        for idx, item in enumerate(items):
+            groups.setdefault(type(item), []).append(idx)
+        results = [None] * len(items) if ordered else []
+        for item_type, indexes in groups.items():
+            group = [items[idx] for idx in indexes]
+            values = None
+            if batch:
+                values = self.call_batch(receiver, group)
+            if values is None:
+                values = self.call_group(receiver, item_type, group)
+            if ordered:
+                for idx, value in zip(indexes, values):
+                    results[idx] = value
             else:
-                result = func_info.func_(cls_, *arg_values, **kwarg_values)
-            cached_dict[cached_key] = result
-            return result
-        except KeyError:
-            handle_error(is_module_function, func_class_name, cls_, args, kwargs)
-        except TypeError:
-            if func_info is None:
-                handle_error(is_module_function, func_class_name, cls_, args, kwargs)
+                results.extend(values)
+        return results
+
+    def imap_receiver(self, receiver, iterable: typing.Iterable) -> typing.Iterator:
+        if self.is_coroutine:
+            raise InvalidOverloadException(f"`{self.__qualname__}` is async, use `gather`")
+        functions = {}
+        for item in iterable:
+            if (func := functions.get(type(item), MISSING)) is MISSING:
+                func = functions[type(item)] = self.group_function(receiver, type(item))
+            if func is None:
+                yield self.dispatch(receiver, (item,), {})
+            elif receiver is None:
+                yield func(item)
             else:
-                raise
+                yield func(receiver, item)
+
+    def group_function(self, receiver, item_type: type):
+        """
+        The function every argument of `item_type` is dispatched to, resolved by type.
+        `None` if the decision depends on the value or the call has to go through `dispatch`
+        (memoized overloads, enabled instrumentation).
+        """
+        if instrumentation.active is not None:
+            return None
+        dispatch_key = (type(receiver), item_type)
+        if (func_info := self.dispatch_cache_.get(dispatch_key)) is None:
+            if not self.prime_types(type(receiver), (item_type,), {}):
+                return None
+            func_info = self.dispatch_cache_[dispatch_key]
+        return func_info.func_ if func_info.direct_call_ else None
+
+    def call_group(self, receiver, item_type: type, group: list) -> list:
+        if (func := self.group_function(receiver, item_type)) is None:
+            return [self.dispatch(receiver, (item,), {}) for item in group]
+        if receiver is None:
+            return [func(item) for item in group]
+        return [func(receiver, item) for item in group]
+
+    def parallel_map(
+        self,
+        *args,
+        executor: concurrent.futures.Executor | None = None,
+        chunksize: int | None = None,
+        ordered: bool = True,
+    ) -> list:
+        """
+        `map` with the items spread over the workers of `executor`, a `ProcessPoolExecutor`
+        with the default number of workers if none is given.
+
+        The items are grouped by type and the overload of each group is resolved once before
+        chunks of `chunksize` items of a group are submitted, the workers call that overload
+        directly. Dispatcher, receiver and items have to be picklable for process pools.
+        """
+        if self.owner_ is None:
+            return self.parallel_map_receiver(None, *args, executor, chunksize, ordered)
+        return self.parallel_map_receiver(*args, executor, chunksize, ordered)
+
+    def parallel_map_receiver(
+        self,
+        receiver,
+        iterable: typing.Iterable,
+        executor: concurrent.futures.Executor | None = None,
+        chunksize: int | None = None,
+        ordered: bool = True,
+    ) -> list:
+        if self.is_coroutine:
+            raise InvalidOverloadException(f"`{self.__qualname__}` is async, use `gather`")
+        if executor is None:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                return self.parallel_map_receiver(receiver, iterable, executor, chunksize, ordered)
+        items = list(iterable)
+        if chunksize is None:
+            chunksize = max(1, len(items) // (4 * (os.cpu_count() or 1)))
+        groups: dict[type, list[int]] = {}
+        for idx, item in enumerate(items):
+            groups.setdefault(type(item), []).append(idx)
+        chunks = []
+        for item_type, indexes in groups.items():
+            dispatcher, position = self.overload_reference(receiver, item_type)
+            for start in range(0, len(indexes), chunksize):
+                chunk = indexes[start : start + chunksize]
+                future = executor.submit(
+                    call_chunk, dispatcher, position, receiver, [items[idx] for idx in chunk]
+                )
+                chunks.append((chunk, future))
+        results = [None] * len(items) if ordered else []
+        for chunk, future in chunks:
+            if ordered:
+                for idx, value in zip(chunk, future.result()):
+                    results[idx] = value
+            else:
+                results.extend(future.result())
+        return results
+
+    def overload_reference(self, receiver, item_type: type) -> tuple["OverloadDispatcher", int]:
+        """
+        The dispatcher declaring the overload for arguments of `item_type` and the position of
+        the overload in it, the position is `None` if each call has to be dispatched.
+        """
+        if self.group_function(receiver, item_type) is None:
+            return self, None
+        func_info = self.dispatch_cache_[(type(receiver), item_type)]
+        for dispatcher in self.mro_dispatchers(type(receiver)):
+            for position, info in enumerate(dispatcher.overloads_):
+                if info is func_info:
+                    return dispatcher, position
+        return self, None
+
+    def call_batch(self, receiver, group: list) -> list | None:
+        """The results of the overload taking `group` as a list, `None` if there is none."""
+        dispatch_key = (type(receiver), list)
+        call = None
+        if (func_info := self.dispatch_cache_.get(dispatch_key)) is None:
+            # without raising, the message of `resolve` would format every item of the group
+            func_info, call = self.find_overload((group,), {}, dispatch_key)
+            if func_info is None:
+                return None
+        annotation = func_info.params_[0][0] if func_info.params_ else None
+        if annotation is not list and typing.get_origin(annotation) is not list:
+            return None
+        args, kwargs = call if call is not None else ((group,), {})
+        if func_info.direct_call_:
+            results = list(call_func(func_info, receiver, args, kwargs))
+        else:
+            results = list(call_memoized(func_info, receiver, args, kwargs))
+        if len(results) != len(group):
+            raise InvalidOverloadException(
+                f"`{func_info.func_.__qualname__}` returned {len(results)} results "
+                f"for a batch of {len(group)} items"
+            )
+        return results
+
+    def cache_info(self) -> CacheInfo:
+        return memoized_cache_info(self.overloads_)
+
+    def cache_clear(self):
+        memoized_cache_clear(self.overloads_)
+
+
+class BoundDispatcher:
+    """
+    An `OverloadDispatcher` bound to the instance it was accessed on.
+
+    Only holds the dispatcher and the instance, like a bound method, so binding on every
+    attribute access is cheap.
+    """
+
+    __slots__ = ("__func__", "__self__")
+
+    def __init__(self, func: OverloadDispatcher, instance):
+        self.__func__ = func
+        self.__self__ = instance
+
+    def __call__(self, *args, **kwargs):
+        return self.__func__.dispatch(self.__self__, args, kwargs)
+
+    def warmup(self, *types, **kw_types) -> int:
+        return self.__func__.warmup_receiver(type(self.__self__), types, kw_types)
+
+    def gather(self, items: typing.Iterable) -> typing.Awaitable[list]:
+        return self.__func__.gather_receiver(self.__self__, items)
+
+    def map(self, iterable: typing.Iterable, *, ordered: bool = True, batch: bool = False) -> list:
+        return self.__func__.map_receiver(self.__self__, iterable, ordered, batch)
+
+    def parallel_map(
+        self,
+        iterable: typing.Iterable,
+        *,
+        executor: concurrent.futures.Executor | None = None,
+        chunksize: int | None = None,
+        ordered: bool = True,
+    ) -> list:
+        return self.__func__.parallel_map_receiver(
+            self.__self__, iterable, executor, chunksize, ordered
+        )
+
+    def imap(self, iterable: typing.Iterable) -> typing.Iterator:
+        return self.__func__.imap_receiver(self.__self__, iterable)
+
+    def __getattr__(self, name):
+        return getattr(self.__func__, name)
+
+    @property
+    def __doc__(self):
+        return self.__func__.__doc__
+
+    @property
+    def __module__(self):
+        return self.__func__.__module__
+
+    @property
+    def __annotations__(self):
+        return self.__func__.__annotations__
+
+    @property
+    def __signature__(self):
+        signature = self.__func__.__signature__
+        return signature.replace(parameters=tuple(signature.parameters.values())[1:])
+
+    def __eq__(self, other):
+        if not isinstance(other, BoundDispatcher):
+            return NotImplemented
+        return self.__func__ is other.__func__ and self.__self__ is other.__self__
+
+    def __hash__(self):
+        return hash((self.__func__, id(self.__self__)))
+
+    def __repr__(self):
+        return f"<bound overloaded method {self.__func__.__qualname__} of {self.__self__!r}>"
+
+    def __reduce__(self):
+        # like a bound method, the instance is pickled and the dispatcher looked up on it
+        return getattr, (self.__self__, self.__func__.__name__)
+
+
+def prime(cls_or_module: type | ModuleType) -> int:
+    """
+    Warm up every overloaded function of a class, including the inherited ones, or of a module
+    and the classes defined in it with all of their annotated signatures.
+
+    Returns the number of dispatch decisions which were cached.
+    """
+    if isinstance(cls_or_module, ModuleType):
+        primed = 0
+        for attr in vars(cls_or_module).values():
+            if isinstance(attr, OverloadDispatcher) and attr.owner_ is None:
+                primed += attr.warmup()
+            elif isinstance(attr, type) and attr.__module__ == cls_or_module.__name__:
+                primed += prime(attr)
+        return primed
 
-    inner.__doc__ = generate_docstring(func_info.lookup_key)
-    inner.__annotations__ = generate_annotations(func_info.lookup_key)
-    inner.__signature__ = generate_signature(func_info.lookup_key, inner.__annotations__)
-    return inner
+    primed = 0
+    seen = set()
+    for obj in cls_or_module.__mro__:
+        for name, attr in vars(obj).items():
+            if isinstance(attr, OverloadDispatcher) and name not in seen:
+                seen.add(name)
+                primed += attr.warmup_receiver(cls_or_module)
+    return primed
 
 
-def generate_signature(lookup_key, merged_annotations):
-    data = __override_items__[lookup_key]
+def generate_signature(overloads: list[FuncInfo], merged_annotations):
+    data = overloads
     # Collect parameter names in order of first appearance across overloads,
     # skipping 'self'.
     seen = []
@@ -0,0 +1,111 @@
+import itertools
+import random
+from collections import abc
+from typing import NamedTuple
+
+
+class ContainerCheck(NamedTuple):
+    """
+    How many elements of a container argument (`list[int]`, `dict[str, X]`, ...) are
+    type checked during dispatch.
+
+    - `ContainerCheck.full()` checks every element.
+    - `ContainerCheck.first(n)` checks the first `n` elements.
+    - `ContainerCheck.sample(k)` checks `k` randomly chosen elements of a sequence,
+      containers without index access are checked like `first(k)`.
+    """
+
+    mode: str
+    size: int | None = None
+
+    @classmethod
+    def full(cls) -> "ContainerCheck":
+        return cls("full")
+
+    @classmethod
+    def first(cls, n: int = 1) -> "ContainerCheck":
+        return cls("first", n)
+
+    @classmethod
+    def sample(cls, k: int) -> "ContainerCheck":
+        return cls("sample", k)
+
+    def elements(self, container):
+        if self.mode == "full":
+            return container
+        if (
+            self.mode == "sample"
+            and isinstance(container, abc.Sequence)
+            and len(container) > self.size
+        ):
+            return [container[idx] for idx in random.sample(range(len(container)), self.size)]
+        return itertools.islice(container, self.size)
+
+
+FIRST_ELEMENT = ContainerCheck.first(1)
+SEQUENCE_ORIGINS = (
+    list,
+    set,
+    frozenset,
+    tuple,
+    abc.Sequence,
+    abc.MutableSequence,
+    abc.Set,
+    abc.MutableSet,
+)
+MAPPING_ORIGINS = (dict, abc.Mapping, abc.MutableMapping)
+
+__default_container_check__ = FIRST_ELEMENT
+
+
+def set_container_check(container_check: ContainerCheck):
+    """Set the strategy used by all overloads which don't define their own."""
+    global __default_container_check__
+    __default_container_check__ = container_check
+
+
+def get_container_check() -> ContainerCheck:
+    return __default_container_check__
+
+
+def sequence_checker(origin, element_checker, container_check: ContainerCheck | None):
+    def check(value) -> bool:
+        if not isinstance(value, origin):
+            return False
+        if element_checker is None:
+            return True
+        strategy = container_check or __default_container_check__
+        return all(element_checker(elem) for elem in strategy.elements(value))
+
+    return check
+
+
+def mapping_checker(origin, key_checker, value_checker, container_check: ContainerCheck | None):
+    def check(value) -> bool:
+        if not isinstance(value, origin):
+            return False
+        if key_checker is None and value_checker is None:
+            return True
+        strategy = container_check or __default_container_check__
+        for key, val in strategy.elements(value.items()):
+            if key_checker is not None and not key_checker(key):
+                return False
+            if value_checker is not None and not value_checker(val):
+                return False
+        return True
+
+    return check
+
+
+def fixed_tuple_checker(element_checkers: tuple):
+    size = len(element_checkers)
+
+    def check(value) -> bool:
+        if not isinstance(value, tuple) or len(value) != size:
+            return False
+        for elem, checker in zip(value, element_checkers):
+            if checker is not None and not checker(elem):
+                return False
+        return True
+
+    return check
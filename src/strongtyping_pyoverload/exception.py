@@ -1,2 +1,10 @@
 class InvalidOverloadException(Exception):
     pass
+
+
+class OverloadConflictException(Exception):
+    pass
+
+
+class OverloadConflictWarning(UserWarning):
+    pass
@@ -1,27 +1,653 @@
+import inspect
+import itertools
+import types
+import typing
+from functools import partial
+
 from strongtyping.strong_typing_utils import check_type
 
-ANY = object()
+from strongtyping_pyoverload.container_check import (
+    MAPPING_ORIGINS,
+    SEQUENCE_ORIGINS,
+    ContainerCheck,
+    fixed_tuple_checker,
+    mapping_checker,
+    sequence_checker,
+)
+from strongtyping_pyoverload.numpy_support import array_checker
+from strongtyping_pyoverload.result_cache import ResultCache
+
+try:
+    from pydantic import BaseModel
+
+    from strongtyping_pyoverload.model_check import ModelValidator
+except (ModuleNotFoundError, ImportError):
+    PYDANTIC_INSTALLED = False
+else:
+    PYDANTIC_INSTALLED = True
+
+UNION_TYPES = (typing.Union, types.UnionType)
+# `type X = ...` aliases, Python >= 3.12
+TYPE_ALIAS_TYPE = getattr(typing, "TypeAliasType", None)
+
+
+def is_plain_class(annotation) -> bool:
+    """True for classes where `check_type` boils down to an `isinstance` check."""
+    if type(annotation) is type:
+        # without a metaclass it's neither a TypedDict, a protocol nor a generic alias
+        return True
+    return (
+        isinstance(annotation, type)
+        and typing.get_origin(annotation) is None
+        and not typing.is_typeddict(annotation)
+        and not getattr(annotation, "_is_protocol", False)
+    )
+
+
+def union_members(annotation) -> tuple | None:
+    """The members of a `Union`/`|` annotation, `None` for anything else."""
+    if typing.get_origin(annotation) in UNION_TYPES:
+        return typing.get_args(annotation)
+    return None
+
+
+def guard_predicates(annotation) -> tuple:
+    """The callables in the metadata of an `Annotated` annotation, values have to pass all of them."""
+    if typing.get_origin(annotation) is not typing.Annotated:
+        return ()
+    return tuple(
+        meta for meta in annotation.__metadata__ if callable(meta) and not isinstance(meta, type)
+    )
+
+
+def base_annotation(annotation):
+    """The type of an `Annotated` annotation without its metadata."""
+    if typing.get_origin(annotation) is typing.Annotated:
+        return annotation.__origin__
+    return annotation
+
+
+def expand_type_alias(annotation):
+    """
+    The value of a `type` alias with its parameters substituted, e.g. `numpy.typing.NDArray`
+    (a `TypeAliasType` in newer NumPy versions) for `ndarray[tuple[Any, ...], dtype[...]]`.
+    """
+    if TYPE_ALIAS_TYPE is None:
+        return annotation
+    if isinstance(annotation, TYPE_ALIAS_TYPE):
+        return expand_type_alias(annotation.__value__)
+    origin = typing.get_origin(annotation)
+    if isinstance(origin, TYPE_ALIAS_TYPE):
+        value = origin.__value__
+        if origin.__type_params__:
+            value = value[typing.get_args(annotation)]
+        return expand_type_alias(value)
+    return annotation
+
+
+def normalize_annotation(annotation):
+    """
+    `Annotated` without guard predicates (e.g. only documentation) stands for its base type,
+    type aliases for their value.
+    """
+    annotation = expand_type_alias(annotation)
+    if typing.get_origin(annotation) is typing.Annotated:
+        base = expand_type_alias(annotation.__origin__)
+        if not guard_predicates(annotation):
+            return base
+        if base is not annotation.__origin__:
+            return typing.Annotated[base, *annotation.__metadata__]
+    return annotation
+
+
+def is_pydantic_model(annotation) -> bool:
+    return PYDANTIC_INSTALLED and isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def is_type_determined(annotation) -> bool:
+    """
+    True if the result of `check_type(value, annotation)` depends only on `type(value)`,
+    which makes every dispatch decision involving this annotation cacheable per type.
+    """
+    if annotation is typing.Any or annotation is None:
+        return True
+    if is_plain_class(annotation):
+        return not is_pydantic_model(annotation)
+    if (members := union_members(annotation)) is not None:
+        return all(is_type_determined(arg) for arg in members)
+    return False
+
+
+def type_bound(annotation):
+    """
+    A type determined annotation which every value matching `annotation` satisfies, e.g. `list`
+    for `list[int]` or the base type of `Annotated`, `Any` if there is none.
+    """
+    if is_type_determined(annotation):
+        return annotation
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return type_bound(annotation.__origin__)
+    if origin is typing.Literal:
+        return typing.Union[tuple(dict.fromkeys(type(arg) for arg in typing.get_args(annotation)))]
+    if (members := union_members(annotation)) is not None:
+        bounds = tuple(type_bound(arg) for arg in members)
+        return typing.Any if typing.Any in bounds else typing.Union[bounds]
+    if typing.is_typeddict(annotation):
+        return dict
+    if is_plain_class(origin):
+        return origin
+    return typing.Any
+
+
+def annotation_specificity(annotation) -> tuple[int, float]:
+    """
+    Sort key of an annotation, more specific annotations have smaller keys:
+    `Literal` < classes (`Annotated` guards before their base type, parametrized generics
+    before the bare ones) < unions (fewer members first) < `Any`.
+
+    Classes are ordered among each other by `specificity_class` (see `annotation_precedes`).
+    """
+    if annotation is typing.Any or annotation is object:
+        return 3, 0
+    if annotation is None:
+        annotation = types.NoneType
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        category, rank = annotation_specificity(annotation.__origin__)
+        return category, rank - 0.5
+    if origin is typing.Literal:
+        return 0, 0
+    if (members := union_members(annotation)) is not None:
+        return 2, len(members)
+    return 1, -0.25 if origin is not None else 0
+
+
+def specificity_class(annotation) -> type | None:
+    """The class which orders `annotation` among other classes, e.g. `list` for `list[int]`."""
+    if annotation is None:
+        return types.NoneType
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return specificity_class(annotation.__origin__)
+    cls = origin or annotation
+    return cls if isinstance(cls, type) else None
+
+
+def annotation_precedes(first, second) -> bool:
+    """
+    True if an overload taking `first` has to be tried before one taking `second`:
+    subclasses before their bases (`list` before `abc.Sequence`), otherwise by
+    `annotation_specificity`. Unrelated classes don't precede each other.
+    """
+    first_key, second_key = annotation_specificity(first), annotation_specificity(second)
+    if first_key[0] == second_key[0] == 1:
+        first_cls, second_cls = specificity_class(first), specificity_class(second)
+        if first_cls is not second_cls and first_cls is not None and second_cls is not None:
+            return issubclass(first_cls, second_cls) and not issubclass(second_cls, first_cls)
+    return first_key < second_key
+
+
+# stands for the end of a parameter list in `FuncInfo.specificity_`
+END_OF_PARAMETERS = object()
+
+
+def overload_precedes(first: "FuncInfo", second: "FuncInfo") -> bool:
+    """
+    True if the overload `first` has to be tried before `second`: fewer `*args`/`**kwargs`
+    first, then the first parameter deciding between their annotations. The end of a
+    parameter list ranks behind every annotation, so `(a: str, *args)` comes before `(*args)`.
+    """
+    first_var, first_params = first.specificity_
+    second_var, second_params = second.specificity_
+    if first_var != second_var:
+        return first_var < second_var
+    for first_param, second_param in itertools.zip_longest(
+        first_params, second_params, fillvalue=END_OF_PARAMETERS
+    ):
+        if first_param is END_OF_PARAMETERS or second_param is END_OF_PARAMETERS:
+            return second_param is END_OF_PARAMETERS and first_param is not END_OF_PARAMETERS
+        if annotation_precedes(first_param, second_param):
+            return True
+        if annotation_precedes(second_param, first_param):
+            return False
+    return False
+
+
+def rank_by_specificity(infos: typing.Iterable["FuncInfo"]) -> list["FuncInfo"]:
+    """
+    `infos` with each overload placed before the overloads it precedes and otherwise
+    in the given order, the ranking is only partial as unrelated classes aren't ordered.
+    """
+    ranked = []
+    for info in infos:
+        # behind every overload preceding it, ahead of the first one it precedes after that
+        position = 1 + max(
+            (idx for idx, other in enumerate(ranked) if overload_precedes(other, info)),
+            default=-1,
+        )
+        for idx in range(position, len(ranked)):
+            if overload_precedes(info, ranked[idx]):
+                position = idx
+                break
+        else:
+            position = len(ranked)
+        ranked.insert(position, info)
+    return ranked
+
+
+def build_checker(annotation, container_check: ContainerCheck | None = None):
+    """
+    Cheapest checker which agrees with `check_type` for `annotation`, `None` if any value matches.
+
+    Plain classes and unions of them are checked with `isinstance`, containers only check
+    the elements selected by `container_check` (or the global default), NumPy arrays only
+    their `dtype` and dimensions, everything else goes through `check_type`.
+    """
+    if annotation is typing.Any or annotation is object:
+        return None
+    if typing.get_origin(annotation) is typing.Annotated:
+        base_checker = build_checker(annotation.__origin__, container_check)
+        if not (predicates := guard_predicates(annotation)):
+            return base_checker
+        return guarded_checker(base_checker, predicates)
+    if is_plain_class(annotation):
+        return isinstance_checker(annotation)
+
+    members = union_members(annotation)
+    if members is not None and all(is_plain_class(arg) or arg is typing.Any for arg in members):
+        if typing.Any in members or object in members:
+            return None
+        return isinstance_checker(members)
+    if (checker := build_container_checker(annotation, container_check)) is not None:
+        return checker
+    if (checker := array_checker(annotation)) is not None:
+        return checker
+    return partial(check_type, type_of=annotation)
+
+
+def build_container_checker(annotation, container_check: ContainerCheck | None):
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is tuple and args and args[-1] is not Ellipsis:
+        return fixed_tuple_checker(tuple(build_checker(arg, container_check) for arg in args))
+    if origin in SEQUENCE_ORIGINS and (len(args) <= 1 or origin is tuple):
+        element_checker = build_checker(args[0], container_check) if args else None
+        return sequence_checker(origin, element_checker, container_check)
+    if origin in MAPPING_ORIGINS and len(args) in (0, 2):
+        key_checker, value_checker = (
+            (build_checker(arg, container_check) for arg in args) if args else (None, None)
+        )
+        return mapping_checker(origin, key_checker, value_checker, container_check)
+    return None
+
+
+def isinstance_checker(classinfo):
+    def check(value) -> bool:
+        return isinstance(value, classinfo)
+
+    return check
+
+
+def guarded_checker(base_checker, predicates: tuple):
+    """The base type is checked first, then the predicates in order until one fails."""
+
+    def check(value) -> bool:
+        if base_checker is not None and not base_checker(value):
+            return False
+        for predicate in predicates:
+            if not predicate(value):
+                return False
+        return True
+
+    return check
+
+
+def build_type_checker(annotation):
+    """
+    Counterpart of `build_checker` which is given the type of a value instead of the value,
+    the annotations which are not `is_type_determined` can't be decided and never match.
+    """
+    if annotation is typing.Any or annotation is object:
+        return None
+    if annotation is None:
+        return issubclass_checker(types.NoneType)
+    if is_type_determined(annotation):
+        members = union_members(annotation) or (annotation,)
+        if typing.Any in members or object in members:
+            return None
+        return issubclass_checker(
+            tuple(types.NoneType if member is None else member for member in members)
+        )
+    return lambda type_: False
+
+
+def issubclass_checker(classinfo):
+    def check(type_) -> bool:
+        return issubclass(type_, classinfo)
+
+    return check
+
+
+def compile_general_matcher(params: list, checkers: tuple):
+    """
+    Matcher for a mixed parameter list, parameters given by keyword are checked by name,
+    the remaining ones positionally in order of declaration.
+    """
+    named_checkers = tuple((param[2], checker) for param, checker in zip(params, checkers))
+
+    def match_general(args_: tuple, kwargs_: dict) -> bool:
+        pos_checkers = []
+        for name, checker in named_checkers:
+            if name in kwargs_:
+                if checker is not None and not checker(kwargs_[name]):
+                    return False
+            else:
+                pos_checkers.append(checker)
+        for arg, checker in zip(args_, pos_checkers):
+            if checker is not None and not checker(arg):
+                return False
+        return True
+
+    return match_general
+
+
+def compile_keyword_only_matcher(params: list, checkers: tuple):
+    size = len(params)
+    named_checkers = tuple((param[2], checker) for param, checker in zip(params, checkers))
+
+    def match_keyword_only(kwargs_: dict) -> bool:
+        if len(kwargs_) != size:
+            return False
+        for name, checker in named_checkers:
+            if name not in kwargs_:
+                return False
+            if checker is not None and not checker(kwargs_[name]):
+                return False
+        return True
+
+    return match_keyword_only
+
+
+def compile_positional_only_matcher(params: list, checkers: tuple):
+    size = len(params)
+
+    def match_positional_only(args_: tuple) -> bool:
+        if len(args_) != size:
+            return False
+        for arg, checker in zip(args_, checkers):
+            if checker is not None and not checker(arg):
+                return False
+        return True
+
+    return match_positional_only
+
+
+def compile_matcher(info: "FuncInfo", checkers: tuple | None = None):
+    """
+    Build the matcher for the parameter shape of `info` once, so a comparison is a single
+    call without re-inspecting the parameters.
+
+    `checkers` replaces the value checkers of `info`, e.g. to match argument types.
+    """
+    params = info.params_
+    checkers = info.checkers_ if checkers is None else checkers
+    if info.is_keyword_only_:
+        return compile_keyword_only_matcher(params, checkers)
+    if info.is_positional_only_:
+        return compile_positional_only_matcher(params, checkers)
+    if info.no_parameter_:
+        return lambda other: False
+
+    size = len(params)
+    match_general = compile_general_matcher(params, checkers)
+    var_positional_pos = info.var_positional_pos_
+    var_keyword_pos = info.var_keyword_pos_
+
+    if info.contains_args_ and info.contains_kwargs_:
+        names = frozenset(param[2] for param in params)
+
+        def match_var_arity(args_, kwargs_):
+            if kv := names.intersection(kwargs_):
+                return match_general((), {key: kwargs_[key] for key in kv})
+            return match_general(args_[:var_positional_pos], kwargs_)
+
+    elif info.contains_args_:
+
+        def match_var_arity(args_, kwargs_):
+            if size == 1:
+                return not kwargs_
+            return match_general(args_[:var_positional_pos], kwargs_)
+
+    elif info.contains_kwargs_:
+        leading_names = tuple(param[2] for param in params[:var_keyword_pos])
+
+        def match_var_arity(args_, kwargs_):
+            if size == 1:
+                return not args_
+            if not args_ and not any(name in kwargs_ for name in leading_names):
+                return not leading_names
+            return match_general(
+                args_, {key: kwargs_[key] for key in leading_names if key in kwargs_}
+            )
+
+    else:
+
+        def match_var_arity(args_, kwargs_):
+            return False
+
+    def match(other) -> bool:
+        args_, kwargs_ = other
+        if size != len(args_) + len(kwargs_):
+            return match_var_arity(args_, kwargs_)
+        return match_general(args_, kwargs_)
+
+    return match
+
+
+class ParamShape(typing.NamedTuple):
+    """
+    Everything about a parameter list which decides if a call can bind to it,
+    independent of the argument values.
+    """
+
+    positional: tuple[str, ...]
+    positional_only: int
+    keyword_only: frozenset[str]
+    required: frozenset[str]
+    has_args: bool
+    has_kwargs: bool
+
+    @classmethod
+    def from_params(cls, params: list) -> "ParamShape":
+        kinds = [param[1] for param in params]
+        return cls(
+            positional=tuple(
+                param[2]
+                for param in params
+                if param[1] in ("POSITIONAL_ONLY", "POSITIONAL_OR_KEYWORD")
+            ),
+            positional_only=kinds.count("POSITIONAL_ONLY"),
+            keyword_only=frozenset(param[2] for param in params if param[1] == "KEYWORD_ONLY"),
+            required=frozenset(
+                param[2]
+                for param in params
+                if param[1] not in ("VAR_POSITIONAL", "VAR_KEYWORD") and not param[3]
+            ),
+            has_args="VAR_POSITIONAL" in kinds,
+            has_kwargs="VAR_KEYWORD" in kinds,
+        )
+
+    def accepts(self, nargs: int, keywords) -> bool:
+        """True if `nargs` positional arguments and `keywords` can bind to these parameters."""
+        if nargs > len(self.positional) and not self.has_args:
+            return False
+        bound = set(self.positional[:nargs])
+        for name in keywords:
+            if name in bound:
+                return False
+            if name in self.keyword_only or name in self.positional[self.positional_only :]:
+                bound.add(name)
+            elif not self.has_kwargs:
+                return False
+        return self.required <= bound
 
 
 class FuncInfo:
-    pydantic_args_: list
-    pydantic_kwargs_: dict
     __slots__ = (
         "func_",
         "params_",
         "func_name_",
         "cls_name_",
+        "owner_",
+        "is_coroutine_",
         "pydantic_params_",
-        "pydantic_kwargs_",
+        "validated_matcher_",
+        "type_determined_",
+        "result_cache_",
+        "container_check_",
+        "annotations_resolved_",
+        "resolve_state_",
+        "checkers_",
+        "is_keyword_only_",
+        "is_positional_only_",
+        "contains_args_",
+        "contains_kwargs_",
+        "no_parameter_",
+        "var_positional_pos_",
+        "var_keyword_pos_",
+        "matcher_",
+        "type_matcher_",
+        "bound_matcher_",
+        "bound_type_matcher_",
+        "shape_",
+        "specificity_",
+        "base_key_",
+        "base_matcher_",
+        "guard_matcher_",
+        "direct_call_",
+        "single_class_",
     )
 
-    def __init__(self, func_, params_: list):
+    def __init__(
+        self,
+        func_,
+        params_: list | None,
+        result_cache_: ResultCache | None = None,
+        container_check_: ContainerCheck | None = None,
+    ):
         self.func_ = func_
         self.func_name_ = func_.__name__
-        self.params_ = params_
         self.cls_name_ = self.extract_class_name_from_func(func_)
-        self.pydantic_params_: list[tuple[int, object]] = []
-        self.pydantic_kwargs_ = {}
+        self.owner_ = self.extract_owner_from_func(func_)
+        self.is_coroutine_ = inspect.iscoroutinefunction(func_)
+        self.result_cache_ = result_cache_
+        self.container_check_ = container_check_
+        self.params_ = None
+        self.annotations_resolved_ = False
+        # `namespace_state` of the last failed attempt to resolve the annotations
+        self.resolve_state_ = None
+        if params_ is not None:
+            self.prepare(params_)
+
+    @property
+    def prepared(self) -> bool:
+        return self.params_ is not None
+
+    def prepare(self, params_: list, annotations_resolved_: bool = True):
+        """
+        Everything dispatch needs to know about the parameters, deferred until the first
+        dispatch for overloads registered with `lazy=True`.
+
+        Without `annotations_resolved_` the annotations still contain unresolved strings and
+        `prepare` is repeated on dispatch until they can be resolved.
+        """
+        self.params_ = [(normalize_annotation(param[0]), *param[1:]) for param in params_]
+        self.type_determined_ = all(is_type_determined(param[0]) for param in self.params_)
+        self.checkers_ = tuple(
+            build_checker(param[0], self.container_check_) for param in self.params_
+        )
+
+        kinds = [param[1] for param in self.params_]
+        self.no_parameter_ = not kinds
+        self.is_keyword_only_ = bool(kinds) and all(kind == "KEYWORD_ONLY" for kind in kinds)
+        self.is_positional_only_ = bool(kinds) and all(kind == "POSITIONAL_ONLY" for kind in kinds)
+        self.contains_args_ = "VAR_POSITIONAL" in kinds
+        self.contains_kwargs_ = "VAR_KEYWORD" in kinds
+        self.var_positional_pos_ = kinds.index("VAR_POSITIONAL") if self.contains_args_ else None
+        self.var_keyword_pos_ = kinds.index("VAR_KEYWORD") if self.contains_kwargs_ else None
+        self.matcher_ = compile_matcher(self)
+        self.type_matcher_ = None
+        if self.type_determined_:
+            self.bound_matcher_ = self.bound_type_matcher_ = None
+        else:
+            # arguments failing on the type bounds are ruled out by their types alone
+            bounds = tuple(type_bound(param[0]) for param in self.params_)
+            self.bound_matcher_ = compile_matcher(self, tuple(map(build_checker, bounds)))
+            self.bound_type_matcher_ = compile_matcher(self, tuple(map(build_type_checker, bounds)))
+        self.shape_ = ParamShape.from_params(self.params_)
+        # the annotations compared by `overload_precedes`
+        self.specificity_ = (
+            int(self.contains_args_) + int(self.contains_kwargs_),
+            tuple(
+                param[0]
+                for param in self.params_
+                if param[1] not in ("VAR_POSITIONAL", "VAR_KEYWORD")
+            ),
+        )
+        # overloads differing only in their `Annotated` guards have the same `base_key_`,
+        # dispatch checks the base types once for all of them and then only the guards
+        guards = tuple(guard_predicates(param[0]) for param in self.params_)
+        if any(guards):
+            self.base_matcher_ = compile_matcher(
+                self,
+                tuple(
+                    build_checker(base_annotation(param[0]), self.container_check_)
+                    for param in self.params_
+                ),
+            )
+            self.guard_matcher_ = compile_matcher(
+                self,
+                tuple(
+                    guarded_checker(None, predicates) if predicates else None
+                    for predicates in guards
+                ),
+            )
+        else:
+            self.base_matcher_ = self.matcher_
+            self.guard_matcher_ = None
+        self.base_key_ = (
+            self.shape_,
+            self.container_check_,
+            tuple(base_annotation(param[0]) for param in self.params_),
+        )
+        # (position, name, validator) of the parameters taking Pydantic models, the validators
+        # are built once, the validated models only exist for the call they belong to
+        self.pydantic_params_ = tuple(
+            (idx, param[2], ModelValidator(param[0]))
+            for idx, param in enumerate(self.params_)
+            if is_pydantic_model(param[0])
+        )
+        # binding was already checked by the shape, omitted defaults are fine
+        self.validated_matcher_ = (
+            compile_general_matcher(self.params_, self.checkers_) if self.pydantic_params_ else None
+        )
+        # not memoized, the (validated) arguments are passed through as is
+        self.direct_call_ = self.result_cache_ is None
+        # the class of the only, positional parameter if the overload is selected by
+        # `isinstance` on a single argument and called as is, `None` otherwise
+        self.single_class_ = (
+            self.params_[0][0]
+            if len(self.params_) == 1
+            and self.params_[0][1] in ("POSITIONAL_ONLY", "POSITIONAL_OR_KEYWORD")
+            and not self.params_[0][3]
+            and is_plain_class(self.params_[0][0])
+            and not self.pydantic_params_
+            and self.direct_call_
+            else None
+        )
+        # last, other threads take the overload as prepared as soon as it is set
+        self.annotations_resolved_ = annotations_resolved_
 
     @staticmethod
     def extract_class_name_from_func(function: object):
@@ -30,49 +656,64 @@ class FuncInfo:
         except IndexError:
             return ""
 
+    @staticmethod
+    def extract_owner_from_func(function: object) -> tuple[str, str]:
+        """Module and qualified name of the namespace `function` is defined in."""
+        return function.__module__, function.__qualname__.rpartition(".")[0]
+
     @property
     def name(self) -> str:
         return self.func_name_
 
     @property
-    def lookup_key(self) -> tuple[str, str]:
-        return self.cls_name_, self.func_name_
+    def lookup_key(self) -> tuple[str, str, str]:
+        return *self.owner_, self.func_name_
 
     @property
     def is_keyword_only(self):
-        if not self.params_:
-            return False
-        return all(obj[1] == "KEYWORD_ONLY" for obj in self.params_)
+        return self.is_keyword_only_
 
     @property
     def is_positional_only(self):
-        if not self.params_:
-            return False
-        return all(obj[1] == "POSITIONAL_ONLY" for obj in self.params_)
+        return self.is_positional_only_
 
     @property
     def contains_args(self):
-        if not self.params_:
-            return False
-        return any(obj[1] == "VAR_POSITIONAL" for obj in self.params_)
+        return self.contains_args_
 
     @property
     def contains_kwargs(self):
-        if not self.params_:
-            return False
-        return any(obj[1] == "VAR_KEYWORD" for obj in self.params_)
+        return self.contains_kwargs_
 
     @property
     def no_parameter(self):
-        return len(self.params_) == 0
+        return self.no_parameter_
 
     @property
     def first_var_positional_pos(self):
-        return [obj[1] == "VAR_POSITIONAL" for obj in self.params_].index(True)
+        return self.var_positional_pos_
 
     @property
     def first_var_keyword_pos(self):
-        return [obj[1] == "VAR_KEYWORD" for obj in self.params_].index(True)
+        return self.var_keyword_pos_
+
+    def match_types(self, other) -> bool:
+        """Like `==` but for the types of the arguments, used to prime the dispatch cache."""
+        if self.type_matcher_ is None:
+            self.type_matcher_ = compile_matcher(
+                self, tuple(build_type_checker(param[0]) for param in self.params_)
+            )
+        return self.type_matcher_(other)
+
+    def rejected_by_type(self, other, by_type: bool = False) -> bool:
+        """
+        For arguments (or with `by_type` their types) which don't match, True if their types
+        alone rule this overload out, which keeps the dispatch decision cacheable.
+        """
+        if self.type_determined_:
+            return True
+        matcher = self.bound_type_matcher_ if by_type else self.bound_matcher_
+        return not matcher(other)
 
     def __str__(self):
         params_txt = "_".join(str(param) for param in self.params_)
@@ -81,85 +722,5 @@ class FuncInfo:
     def __repr__(self):
         return f"{self.cls_name_}-{self.func_name_}"
 
-    def _validated_keyword_only(self, other):
-        if len(self.params_) != len(other):
-            return False
-        for param in self.params_:
-            if obj := other.get(param[2]):
-                if param[0] != str(ANY):
-                    if not check_type(obj, param[0]):
-                        return False
-            else:
-                return False
-        return True
-
-    def _validate_positional_only(self, other):
-        if len(self.params_) != len(other):
-            return False
-        for param, arg in zip(self.params_, other):
-            if param[0] != str(ANY):
-                if not check_type(arg, param[0]):
-                    return False
-        return True
-
-    def _validate_general(self, args_, kwargs_):
-        pos_args = []
-        for param in self.params_:
-            if obj := kwargs_.get(param[2]):
-                if param[0] != str(ANY):
-                    if not check_type(obj, param[0]):
-                        return False
-            else:
-                pos_args.append(param)
-        for arg, param in zip(args_, pos_args):
-            if param[0] != str(ANY):
-                if not check_type(arg, param[0]):
-                    return False
-        return True
-
-    def _validate_with_var_positional(self, args_: tuple, kwargs_: dict):
-        arg_values = args_[: self.first_var_positional_pos]
-        return self._validate_general(arg_values, kwargs_)
-
-    def _validate_with_var_keyword(self, args_: tuple, kwargs_: dict):
-        kwarg_values = [obj[2] for obj in list(self.params_)[: self.first_var_keyword_pos]]
-        if not any(obj in kwargs_ for obj in kwarg_values) and not args_:
-            if kwarg_values:
-                return False
-            return True
-        return self._validate_general(
-            args_, {key: kwargs_[key] for key in kwarg_values if key in kwargs_}
-        )
-
-    def _validate_with_var_pos_and_keyword(self, args_: tuple, kwargs_: dict):
-        if kv := (set([obj[2] for obj in self.params_]) & set(kwargs_.keys())):
-            return self._validate_general(tuple(), {key: kwargs_[key] for key in kv})
-        else:
-            return self._validate_general(args_[: self.first_var_positional_pos], kwargs_)
-
     def __eq__(self, other):
-        if self.is_keyword_only:
-            return self._validated_keyword_only(other)
-        elif self.is_positional_only:
-            return self._validate_positional_only(other)
-        else:
-            if self.no_parameter and other:
-                return False
-            args_, kwargs_ = other
-            if len(self.params_) != len(args_) + len(kwargs_):
-                if self.contains_args and self.contains_kwargs:
-                    return self._validate_with_var_pos_and_keyword(args_, kwargs_)
-                elif self.contains_args:
-                    if len(self.params_) == 1 and not kwargs_:
-                        return True
-                    elif len(self.params_) == 1 and kwargs_:
-                        return False
-                    return self._validate_with_var_positional(args_, kwargs_)
-                elif self.contains_kwargs:
-                    if len(self.params_) == 1 and not args_:
-                        return True
-                    elif len(self.params_) == 1 and args_:
-                        return False
-                    return self._validate_with_var_keyword(args_, kwargs_)
-                return False
-            return self._validate_general(args_, kwargs_)
+        return self.matcher_(other)
@@ -0,0 +1,26 @@
+import functools
+
+
+def cached_guard(predicate=None, /, *, maxsize: int | None = 1024):
+    """
+    Mark a pure guard predicate of an `Annotated` overload, its result is cached per value
+    (and type, `1` and `True` are cached separately) in a LRU cache of `maxsize` entries.
+
+    Unhashable values are always passed to the predicate.
+    """
+    if predicate is None:
+        return functools.partial(cached_guard, maxsize=maxsize)
+
+    cached = functools.lru_cache(maxsize=maxsize, typed=True)(predicate)
+
+    @functools.wraps(predicate)
+    def guard(value) -> bool:
+        try:
+            hash(value)
+        except TypeError:
+            return predicate(value)
+        return cached(value)
+
+    guard.cache_info = cached.cache_info
+    guard.cache_clear = cached.cache_clear
+    return guard
@@ -0,0 +1,106 @@
+import collections
+import inspect
+import weakref
+from typing import Callable, NamedTuple
+
+
+class DispatchStats:
+    """
+    Counters of one overloaded function, collected while instrumentation is enabled.
+
+    - `calls`: number of dispatched calls
+    - `cache_hits`: calls whose overload was found in the dispatch cache
+    - `candidates_checked`: overloads whose parameters were checked against the arguments
+    - `resolve_time_ns`: time spent finding the overload on cache misses
+    - `validation_time_ns`: part of it spent validating Pydantic models
+    - `selected`: calls per overload function, by its qualified name and signature
+    """
+
+    __slots__ = (
+        "calls",
+        "cache_hits",
+        "candidates_checked",
+        "resolve_time_ns",
+        "validation_time_ns",
+        "selected",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.candidates_checked = 0
+        self.resolve_time_ns = 0
+        self.validation_time_ns = 0
+        self.selected: collections.Counter = collections.Counter()
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "candidates_checked": self.candidates_checked,
+            "resolve_time_ns": self.resolve_time_ns,
+            "validation_time_ns": self.validation_time_ns,
+            "selected": {
+                f"{func.__qualname__}{inspect.signature(func)}": count
+                for func, count in self.selected.items()
+            },
+        }
+
+
+class Hooks(NamedTuple):
+    """
+    Callbacks of the enabled instrumentation, each one is optional.
+
+    - `on_dispatch(dispatcher, func, args, kwargs)` before the selected overload `func` is called
+    - `on_miss(dispatcher, args, kwargs)` when the overload isn't in the dispatch cache
+    - `on_error(dispatcher, args, kwargs, exception)` when no overload matches
+    """
+
+    on_dispatch: Callable | None = None
+    on_miss: Callable | None = None
+    on_error: Callable | None = None
+
+
+# `None` while disabled, which is all the dispatch checks for
+active: Hooks | None = None
+# dispatchers which collected statistics, by dispatcher
+__collected__: "weakref.WeakKeyDictionary[object, DispatchStats]" = weakref.WeakKeyDictionary()
+
+
+def enable_instrumentation(
+    *,
+    on_dispatch: Callable | None = None,
+    on_miss: Callable | None = None,
+    on_error: Callable | None = None,
+):
+    """Collect `DispatchStats` for every overloaded function and call the given hooks."""
+    global active
+    active = Hooks(on_dispatch, on_miss, on_error)
+
+
+def disable_instrumentation():
+    """Stop collecting, the statistics collected so far are kept."""
+    global active
+    active = None
+
+
+def stats_for(dispatcher) -> DispatchStats:
+    if (stats := __collected__.get(dispatcher)) is None:
+        stats = __collected__[dispatcher] = DispatchStats()
+    return stats
+
+
+def stats() -> dict[str, dict]:
+    """Snapshot of the statistics of every overloaded function by its qualified name."""
+    return {
+        f"{dispatcher.__module__}.{dispatcher.__qualname__}": dispatch_stats.snapshot()
+        for dispatcher, dispatch_stats in list(__collected__.items())
+    }
+
+
+def reset_stats():
+    for dispatch_stats in list(__collected__.values()):
+        dispatch_stats.reset()
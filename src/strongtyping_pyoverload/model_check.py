@@ -0,0 +1,72 @@
+from collections import abc
+
+from pydantic import BaseModel, RootModel, ValidationError
+
+# upper bound of remembered key sets per model, the cache starts over when reached
+KEY_SET_CACHE_SIZE = 256
+
+
+def required_keys(model: type[BaseModel]) -> tuple[frozenset[str], ...] | None:
+    """
+    For every required field the keys it can be given by, `None` if the input of the model
+    can't be judged by its keys (root models, `before`/`wrap` model validators, alias paths).
+    """
+    if issubclass(model, RootModel):
+        return None
+    validators = model.__pydantic_decorators__.model_validators.values()
+    if any(validator.info.mode in ("before", "wrap") for validator in validators):
+        return None
+    required = []
+    for name, field in model.model_fields.items():
+        if not field.is_required():
+            continue
+        if field.validation_alias is not None and not isinstance(field.validation_alias, str):
+            return None
+        required.append(
+            frozenset(key for key in (name, field.alias, field.validation_alias) if key)
+        )
+    return tuple(required)
+
+
+class ModelValidator:
+    """
+    Validates the arguments of one Pydantic model parameter.
+
+    Instances of the model are taken as they are and mappings which lack a required field
+    are rejected without running `model_validate`, the decision is remembered per key set.
+    """
+
+    __slots__ = ("model", "required", "from_attributes", "revalidate", "key_sets")
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self.required = required_keys(model)
+        self.from_attributes = model.model_config.get("from_attributes", False)
+        self.revalidate = model.model_config.get("revalidate_instances", "never") != "never"
+        self.key_sets: dict[frozenset, bool] = {}
+
+    def plausible(self, value) -> bool:
+        """False if `value` can't validate, True if `model_validate` has to decide."""
+        if self.required is None:
+            return True
+        if not isinstance(value, abc.Mapping):
+            return self.from_attributes
+        keys = frozenset(value)
+        if (result := self.key_sets.get(keys)) is None:
+            if len(self.key_sets) >= KEY_SET_CACHE_SIZE:
+                self.key_sets.clear()
+            result = self.key_sets[keys] = all(
+                not accepted.isdisjoint(keys) for accepted in self.required
+            )
+        return result
+
+    def __call__(self, value) -> BaseModel | None:
+        """The validated model, `None` if `value` doesn't validate."""
+        if isinstance(value, self.model) and not self.revalidate:
+            return value
+        if not self.plausible(value):
+            return None
+        try:
+            return self.model.model_validate(value)
+        except (AttributeError, TypeError, ValidationError):
+            return None
@@ -0,0 +1,98 @@
+"""
+Dispatch on NumPy arrays by `dtype` and dimensions without looking at their elements.
+
+NumPy is never imported here, annotations are only recognized once the application
+imported it, which it did if it annotates with `numpy.typing.NDArray`.
+"""
+
+import sys
+import typing
+
+
+class NDim:
+    """Marker for `Annotated` array parameters, matches arrays with `ndim` dimensions."""
+
+    __slots__ = ("ndim",)
+
+    def __init__(self, ndim: int):
+        self.ndim = ndim
+
+    def __call__(self, value) -> bool:
+        return value.ndim == self.ndim
+
+    def __eq__(self, other):
+        if not isinstance(other, NDim):
+            return NotImplemented
+        return self.ndim == other.ndim
+
+    def __hash__(self):
+        return hash((NDim, self.ndim))
+
+    def __repr__(self):
+        return f"NDim({self.ndim})"
+
+
+class Shape:
+    """
+    Marker for `Annotated` array parameters, matches arrays of this shape,
+    `None` matches any length of that dimension: `Shape(None, 3)`.
+    """
+
+    __slots__ = ("dims",)
+
+    def __init__(self, *dims: int | None):
+        self.dims = dims
+
+    def __call__(self, value) -> bool:
+        shape = value.shape
+        if len(shape) != len(self.dims):
+            return False
+        for dim, size in zip(self.dims, shape):
+            if dim is not None and dim != size:
+                return False
+        return True
+
+    def __eq__(self, other):
+        if not isinstance(other, Shape):
+            return NotImplemented
+        return self.dims == other.dims
+
+    def __hash__(self):
+        return hash((Shape, self.dims))
+
+    def __repr__(self):
+        return f"Shape({', '.join(map(repr, self.dims))})"
+
+
+def array_checker(annotation):
+    """
+    Checker of `numpy.ndarray[shape, dtype]` annotations (e.g. `NDArray[np.float64]`) which
+    only compares `value.dtype` and, for fixed size shapes like `tuple[int, int]`, `value.ndim`.
+    `None` for other annotations or if NumPy wasn't imported.
+
+    Type aliases like `NDArray` have to be expanded before (see `normalize_annotation`).
+    """
+    numpy = sys.modules.get("numpy")
+    if numpy is None or typing.get_origin(annotation) is not numpy.ndarray:
+        return None
+    shape, dtype = (*typing.get_args(annotation), typing.Any, typing.Any)[:2]
+    ndim = None
+    shape_args = typing.get_args(shape)
+    if typing.get_origin(shape) is tuple and shape_args and shape_args[-1] is not Ellipsis:
+        ndim = len(shape_args)
+    scalar = typing.get_args(dtype)[0] if typing.get_origin(dtype) is numpy.dtype else typing.Any
+    # `np.floating[Any]` and the like match all of their subtypes
+    scalar = typing.get_origin(scalar) or scalar
+    # `typing.Any` is a class since Python 3.11 but matches every dtype
+    if scalar is typing.Any or not isinstance(scalar, type):
+        scalar = None
+    ndarray = numpy.ndarray
+
+    def check(value) -> bool:
+        if not isinstance(value, ndarray):
+            return False
+        if ndim is not None and value.ndim != ndim:
+            return False
+        return scalar is None or issubclass(value.dtype.type, scalar)
+
+    return check
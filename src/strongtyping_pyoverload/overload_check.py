@@ -0,0 +1,131 @@
+import inspect
+import os
+import typing
+import warnings
+from types import NoneType
+
+from strongtyping_pyoverload.exception import OverloadConflictException, OverloadConflictWarning
+from strongtyping_pyoverload.func_info import (
+    FuncInfo,
+    is_type_determined,
+    overload_precedes,
+    union_members,
+)
+
+MODES = ("ignore", "warn", "raise")
+# warnings are attributed to the first frame outside of the package
+PACKAGE_DIR = os.path.dirname(__file__) + os.sep
+
+# "raise" is meant for CI, `STRONGTYPING_PYOVERLOAD_STRICT=1` turns it on for a whole run
+__overload_check_mode__ = (
+    "raise" if os.environ.get("STRONGTYPING_PYOVERLOAD_STRICT", "") not in ("", "0") else "warn"
+)
+
+
+def set_overload_check(mode: str):
+    """
+    What happens when a new overload duplicates, shadows or is ambiguous with an overload
+    registered before: `"ignore"`, `"warn"` (default) or `"raise"`.
+    """
+    global __overload_check_mode__
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+    __overload_check_mode__ = mode
+
+
+def get_overload_check() -> str:
+    return __overload_check_mode__
+
+
+def covers(broad, narrow) -> bool | None:
+    """
+    True if every value matching `narrow` matches `broad`, `None` if that can't be decided
+    from the annotations alone.
+    """
+    if broad is typing.Any or broad is object or broad == narrow:
+        return True
+    if narrow is typing.Any or narrow is object:
+        return False
+    if not (is_type_determined(broad) and is_type_determined(narrow)):
+        return None
+    broad_members = tuple(
+        NoneType if member is None else member for member in union_members(broad) or (broad,)
+    )
+    narrow_members = union_members(narrow) or (narrow,)
+    return all(
+        issubclass(NoneType if member is None else member, broad_members)
+        for member in narrow_members
+    )
+
+
+def overlaps(first, second) -> bool:
+    """True if a value can match both type determined annotations, e.g. `int | str` and `str`."""
+    if first is typing.Any or second is typing.Any:
+        return True
+    first_members = tuple(
+        NoneType if member is None else member for member in union_members(first) or (first,)
+    )
+    second_members = tuple(
+        NoneType if member is None else member for member in union_members(second) or (second,)
+    )
+    return any(
+        issubclass(first_member, second_member) or issubclass(second_member, first_member)
+        for first_member in first_members
+        for second_member in second_members
+    )
+
+
+def find_conflict(first: FuncInfo, second: FuncInfo) -> str | None:
+    """
+    Why `second`, which is tried after `first`, is a problem: it's a duplicate of `first`,
+    never reached because `first` accepts everything it does, or neither of them is more
+    specific for all arguments they both accept.
+    """
+    if first.shape_ != second.shape_:
+        return None
+    first_wider = second_wider = True
+    for (broad, *_), (narrow, *_) in zip(first.params_, second.params_):
+        first_covers = covers(broad, narrow)
+        second_covers = covers(narrow, broad)
+        if first_covers is None or second_covers is None:
+            return None
+        if not first_covers and not second_covers and not overlaps(broad, narrow):
+            # the parameter tells them apart
+            return None
+        first_wider = first_wider and first_covers
+        second_wider = second_wider and second_covers
+    if first_wider and second_wider:
+        return "duplicates"
+    if first_wider:
+        return "is unreachable because of"
+    if not second_wider:
+        return "is ambiguous with"
+    return None
+
+
+def describe(info: FuncInfo) -> str:
+    try:
+        return f"{info.func_.__qualname__}{inspect.signature(info.func_)}"
+    except (TypeError, ValueError):
+        return info.func_.__qualname__
+
+
+def check_registration(new: FuncInfo, registered: list[FuncInfo]):
+    """Compare the overload `new` with the ones `registered` before for the same name."""
+    if __overload_check_mode__ == "ignore" or not new.annotations_resolved_:
+        return
+    for info in registered:
+        if not info.annotations_resolved_:
+            continue
+        # equally specific overloads are tried in order of registration
+        if overload_precedes(new, info):
+            first, second = new, info
+        else:
+            first, second = info, new
+        if (conflict := find_conflict(first, second)) is None:
+            continue
+        message = f"overload `{describe(second)}` {conflict} `{describe(first)}`"
+        if __overload_check_mode__ == "raise":
+            raise OverloadConflictException(message)
+        # checks deferred to the first dispatch run deeper in the package than registration
+        warnings.warn(message, OverloadConflictWarning, skip_file_prefixes=(PACKAGE_DIR,))
@@ -0,0 +1,49 @@
+from collections import defaultdict
+from typing import Iterable
+
+from strongtyping_pyoverload.func_info import FuncInfo, ParamShape
+
+# upper bound of remembered call shapes per index, the cache starts over when reached
+CALL_SHAPE_CACHE_SIZE = 1024
+
+
+class OverloadIndex:
+    """
+    Overloads of one lookup bucketed by their parameter shape.
+
+    A call only has to type check the overloads of the buckets its shape (number of
+    positional arguments and keyword names) can bind to, the selection is kept per call
+    shape and preserves the registration order.
+    """
+
+    __slots__ = ("infos", "buckets", "unresolved", "single_dispatch", "_by_call_shape")
+
+    def __init__(self, infos: Iterable[FuncInfo]):
+        self.infos: list[FuncInfo] = list(infos)
+        self.buckets: dict[ParamShape, list[FuncInfo]] = defaultdict(list)
+        for info in self.infos:
+            self.buckets[info.shape_].append(info)
+        # overloads with annotations which couldn't be resolved yet
+        self.unresolved: list[FuncInfo] = [
+            info for info in self.infos if not info.annotations_resolved_
+        ]
+        # every overload takes one positional argument annotated with a plain class, which
+        # makes the selected function depend only on the type of that argument
+        self.single_dispatch = bool(self.infos) and all(
+            info.single_class_ is not None for info in self.infos
+        )
+        self._by_call_shape: dict[tuple[int, frozenset], tuple[FuncInfo, ...]] = {}
+
+    def candidates(self, nargs: int, keywords) -> tuple[FuncInfo, ...]:
+        call_shape = (nargs, frozenset(keywords))
+        try:
+            return self._by_call_shape[call_shape]
+        except KeyError:
+            pass
+        if len(self._by_call_shape) >= CALL_SHAPE_CACHE_SIZE:
+            self._by_call_shape.clear()
+        accepted = {shape for shape in self.buckets if shape.accepts(nargs, call_shape[1])}
+        result = self._by_call_shape[call_shape] = tuple(
+            info for info in self.infos if info.shape_ in accepted
+        )
+        return result
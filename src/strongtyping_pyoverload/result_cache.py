@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class ResultCache:
+    """
+    Bounded LRU store for the results of a memoized overload.
+
+    `maxsize=None` disables eviction, `ttl` (in seconds) drops entries older than that.
+    """
+
+    __slots__ = ("maxsize", "ttl", "hits", "misses", "_data")
+
+    def __init__(self, maxsize: int | None = 128, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,17 @@
+import pytest
+
+from strongtyping_pyoverload import class_tools
+from strongtyping_pyoverload.overload_check import get_overload_check, set_overload_check
+
+
+@pytest.fixture(autouse=True)
+def default_overload_settings(monkeypatch):
+    """
+    Tests run with the defaults whatever `STRONGTYPING_PYOVERLOAD_STRICT` and
+    `STRONGTYPING_PYOVERLOAD_LAZY` are set to, tests needing others set them themselves.
+    """
+    monkeypatch.setattr(class_tools, "LAZY_REGISTRATION", False)
+    mode = get_overload_check()
+    set_overload_check("warn")
+    yield
+    set_overload_check(mode)
@@ -7,3 +7,9 @@ def nested_func(a: int):
 @overload
 def nested_func(a: str):
     return f"str: {a}"
+
+
+class Base:
+    @overload
+    def process(self, a: int):
+        return f"nested int: {a}"
@@ -40,3 +40,19 @@ def test_annotations_update():
     # __annotations__ should be present and accurate on the wrapped function
     expected_keys = {"x", "return"}
     assert all(k in example.action.__annotations__ for k in expected_keys)
+
+def test_metadata_does_not_touch_overloads():
+    class Lazy:
+        @overload
+        def action(self, x: int) -> int:
+            return x
+
+        assert "__annotations__" not in vars(action)
+
+        @overload
+        def action(self, x: str) -> str:
+            return x
+
+    first = Lazy.action.overloads[0]
+    assert Lazy.action.__annotations__["x"] == Union[int, str]
+    assert first.__annotations__ == {"x": int, "return": int}
@@ -55,3 +55,64 @@ def test_annotated_with_metadata_fallback():
     # If the dispatcher can't evaluate the string "priority", 
     # it should at least match str
     assert "Normal test" in ex.do("test") or "Priority test" in ex.do("test")
+
+
+def test_guards_share_the_base_type_check():
+    instance_checks = []
+
+    class CountingMeta(type):
+        def __instancecheck__(cls, instance):
+            instance_checks.append(instance)
+            return super().__instancecheck__(instance)
+
+    class Base(metaclass=CountingMeta):
+        def __init__(self, value):
+            self.value = value
+
+    class Child(Base):
+        pass
+
+    class Rules:
+        @overload
+        def apply(self, x: Annotated[Base, lambda obj: obj.value > 10]):
+            return "large"
+
+        @overload
+        def apply(self, x: Annotated[Base, lambda obj: obj.value < 0]):
+            return "negative"
+
+        @overload
+        def apply(self, x: Base):
+            return "base"
+
+    rules = Rules()
+    assert rules.apply(Child(20)) == "large"
+    assert rules.apply(Child(-1)) == "negative"
+    instance_checks.clear()
+    assert rules.apply(Child(5)) == "base"
+    assert len(instance_checks) == 1
+
+
+def test_cached_guard():
+    from strongtyping_pyoverload.guards import cached_guard
+
+    calls = []
+
+    @cached_guard(maxsize=16)
+    def is_prime(value):
+        calls.append(value)
+        return value > 1 and all(value % div for div in range(2, value))
+
+    class Numbers:
+        @overload
+        def kind(self, x: Annotated[int, is_prime]):
+            return "prime"
+
+        @overload
+        def kind(self, x: int):
+            return "other"
+
+    numbers = Numbers()
+    assert [numbers.kind(7), numbers.kind(7), numbers.kind(8)] == ["prime", "prime", "other"]
+    assert calls == [7, 8]
+    assert is_prime.cache_info().hits == 1
@@ -0,0 +1,117 @@
+import asyncio
+import inspect
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import InvalidOverloadException
+
+
+class Handler:
+    def __init__(self):
+        self.calls = []
+
+    @overload
+    async def handle(self, x: int):
+        self.calls.append(x)
+        await asyncio.sleep(0)
+        return x * 2
+
+    @overload
+    async def handle(self, x: str):
+        self.calls.append(x)
+        await asyncio.sleep(0)
+        return x.upper()
+
+    @overload(memoize=True)
+    async def lookup(self, key: str):
+        self.calls.append(key)
+        return len(key)
+
+
+def test_returns_the_coroutine_of_the_overload():
+    handler = Handler()
+    call = handler.handle(2)
+    assert inspect.iscoroutine(call)
+    assert call.cr_code is Handler.handle.overloads[0].__code__
+    assert asyncio.run(call) == 4
+    assert asyncio.run(handler.handle("a")) == "A"
+    assert Handler.handle.is_coroutine
+    if hasattr(inspect, "markcoroutinefunction"):
+        assert inspect.iscoroutinefunction(handler.handle)
+
+
+def test_memoize_stores_the_result():
+    handler = Handler()
+
+    async def main():
+        return [await handler.lookup("abc"), await handler.lookup("abc")]
+
+    assert asyncio.run(main()) == [3, 3]
+    assert handler.calls == ["abc"]
+    assert Handler.lookup.cache_info().hits == 1
+
+
+def test_mixed_overloads_are_rejected():
+    with pytest.raises(InvalidOverloadException, match="mix"):
+
+        class Mixed:
+            @overload
+            async def run(self, x: int):
+                return x
+
+            @overload
+            def run(self, x: str):
+                return x
+
+
+def test_mixed_overloads_across_bases_are_rejected():
+    class Base:
+        @overload
+        def run(self, x: int):
+            return x
+
+    class Child(Base):
+        @overload
+        async def run(self, x: str):
+            return x
+
+    with pytest.raises(InvalidOverloadException, match="mix"):
+        asyncio.run(Child().run("a"))
+
+
+def test_gather():
+    handler = Handler()
+    items = [1, "a", 2, "b"]
+    assert asyncio.run(handler.handle.gather(items)) == [2, "A", 4, "B"]
+    assert handler.calls == items
+    assert set(Handler.handle.dispatch_cache_) == {(Handler, int), (Handler, str)}
+    assert asyncio.run(Handler.handle.gather(handler, [3])) == [6]
+
+
+def test_gather_without_match_awaits_nothing():
+    handler = Handler()
+    with pytest.raises(InvalidOverloadException):
+        asyncio.run(handler.handle.gather([1, 1.5]))
+    assert handler.calls == []
+
+
+def test_gather_module_function():
+    @overload
+    async def double(x: int):
+        return x * 2
+
+    @overload
+    async def double(x: str):
+        return x * 2
+
+    assert asyncio.run(double.gather([1, "a"])) == [2, "aa"]
+
+
+def test_gather_needs_async_overloads():
+    @overload
+    def double(x: int):
+        return x * 2
+
+    with pytest.raises(InvalidOverloadException):
+        asyncio.run(double.gather([1]))
@@ -0,0 +1,74 @@
+import pytest
+from typing import List
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import InvalidOverloadException
+from strongtyping_pyoverload.container_check import (
+    ContainerCheck,
+    get_container_check,
+    set_container_check,
+)
+
+
+class Batch:
+    @overload
+    def run(self, values: list[int]):
+        return "ints"
+
+    @overload
+    def run(self, values: list[str]):
+        return "strs"
+
+    @overload
+    def run(self, values: dict[str, int]):
+        return "mapping"
+
+    @overload
+    def run(self, values: tuple[int, str]):
+        return "pair"
+
+    @overload(container_check=ContainerCheck.full())
+    def strict(self, values: List[int]):
+        return "ints"
+
+    @overload
+    def strict(self, values: list):
+        return "mixed"
+
+
+@pytest.fixture
+def restore_container_check():
+    previous = get_container_check()
+    yield
+    set_container_check(previous)
+
+
+def test_default_checks_first_element_only():
+    batch = Batch()
+    assert batch.run(list(range(100_000))) == "ints"
+    assert batch.run(["a", 1]) == "strs"
+    assert batch.run({"a": 1}) == "mapping"
+    assert batch.run((1, "a")) == "pair"
+
+
+def test_strict_overload_checks_every_element():
+    batch = Batch()
+    assert batch.strict([1, 2, 3]) == "ints"
+    assert batch.strict([1, 2, "3"]) == "mixed"
+
+
+def test_global_container_check(restore_container_check):
+    batch = Batch()
+    set_container_check(ContainerCheck.full())
+    with pytest.raises(InvalidOverloadException):
+        batch.run([1, "a"])
+    set_container_check(ContainerCheck.sample(3))
+    assert batch.run([1] * 1000) == "ints"
+
+
+def test_container_check_selects_elements():
+    values = list(range(10))
+    assert list(ContainerCheck.full().elements(values)) == values
+    assert list(ContainerCheck.first(3).elements(values)) == [0, 1, 2]
+    sample = ContainerCheck.sample(4).elements(values)
+    assert len(sample) == 4 and set(sample) <= set(values)
@@ -0,0 +1,196 @@
+import inspect
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.class_tools import BoundDispatcher, OverloadDispatcher
+from strongtyping_pyoverload.exception import InvalidOverloadException
+
+
+class Shape:
+    @overload
+    def area(self, side: int):
+        return side * side
+
+    @overload
+    def area(self, width: int, height: int):
+        return width * height
+
+
+class Square(Shape):
+    pass
+
+
+def test_one_dispatcher_per_name():
+    assert isinstance(Shape.__dict__["area"], OverloadDispatcher)
+    assert Shape.area.overloads == tuple(info.func_ for info in Shape.area.overloads_)
+    assert len(Shape.area.overloads) == 2
+    assert Shape.area.owner_ is Shape
+
+
+def test_binding_per_instance():
+    shape = Shape()
+    bound = shape.area
+    assert isinstance(bound, BoundDispatcher)
+    assert bound.__self__ is shape
+    assert bound.__func__ is Shape.area
+    assert bound == shape.area
+    # APIs taking "a callable or a tuple" (e.g. Django's `path()`) must see a callable
+    assert not isinstance(bound, tuple)
+    with pytest.raises(TypeError):
+        len(bound)
+    assert bound(3) == 9
+    assert bound(2, 5) == 10
+    assert "self" not in inspect.signature(bound).parameters
+    assert "self" in inspect.signature(Shape.area).parameters
+
+
+def test_unbound_call_through_class():
+    assert Shape.area(Shape(), 4) == 16
+    with pytest.raises(InvalidOverloadException):
+        Shape.area()
+
+
+def test_inherited_without_override():
+    assert Square().area(3) == 9
+    assert Square().area(3, 4) == 12
+
+
+def test_lazy_registration():
+    class Command:
+        @overload(lazy=True)
+        def run(self, name: str):
+            return name
+
+        @overload(lazy=True)
+        def run(self, count: int):
+            return count
+
+    assert not any(info.prepared for info in Command.run.overloads_)
+    assert Command().run(3) == 3
+    assert all(info.prepared for info in Command.run.overloads_)
+    assert Command().run("a") == "a"
+
+
+class Formatter:
+    @overload
+    def format(self, value: int):
+        return "int"
+
+    @overload
+    def format(self, value: str):
+        return "str"
+
+    @overload
+    def format(self, value: object):
+        return "object"
+
+
+def test_single_dispatch_table():
+    formatter = Formatter()
+    assert formatter.format(1) == "int"
+    assert formatter.format(True) == "int"
+    assert formatter.format(1.5) == "object"
+    assert Formatter.format.single_dispatch_ == {
+        (Formatter, int): Formatter.format.overloads[0],
+        (Formatter, bool): Formatter.format.overloads[0],
+        (Formatter, float): Formatter.format.overloads[2],
+    }
+    # keyword arguments go through the dispatch cache
+    assert formatter.format(value="a") == "str"
+    assert len(Formatter.format.single_dispatch_) == 3
+
+
+def test_single_dispatch_module_function():
+    @overload
+    def describe(value: int):
+        return "int"
+
+    @overload
+    def describe(value: str):
+        return "str"
+
+    assert describe(1) == "int"
+    assert describe("a") == "str"
+    assert set(describe.single_dispatch_) == {(type(None), int), (type(None), str)}
+
+
+def test_single_dispatch_not_used_for_other_overloads():
+    class Mixed:
+        @overload
+        def run(self, value: int):
+            return "int"
+
+        @overload
+        def run(self, value: str, times: int):
+            return "str"
+
+        @overload(memoize=True)
+        def cached(self, value: int):
+            return "int"
+
+    assert Mixed().run(1) == "int"
+    assert Mixed().run("a", 2) == "str"
+    assert Mixed().cached(1) == "int"
+    assert not Mixed.run.single_dispatch_
+    assert not Mixed.cached.single_dispatch_
+    assert (Mixed, int) in Mixed.run.dispatch_cache_
+
+
+def test_single_dispatch_reset_on_register():
+    class Growing:
+        @overload
+        def run(self, value: object):
+            return "object"
+
+    assert Growing().run(1) == "object"
+    assert (Growing, int) in Growing.run.single_dispatch_
+
+    @overload
+    def run(self, value: int):
+        return "int"
+
+    Growing.run.register(run.overloads_[0])
+    assert not Growing.run.single_dispatch_
+    assert Growing().run(1) == "int"
+
+
+def test_lazy_registration_from_threads():
+    import sys
+    import threading
+
+    errors = []
+
+    def trial():
+        class Command:
+            @overload(lazy=True)
+            def run(self, name: str):
+                return name
+
+            @overload(lazy=True)
+            def run(self, count: int):
+                return count
+
+        barrier = threading.Barrier(6)
+
+        def call(value):
+            barrier.wait()
+            try:
+                assert Command().run(value) == value
+            except Exception as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=call, args=(idx,)) for idx in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(50):
+            trial()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
@@ -100,3 +100,112 @@ def test_deep_inheritance_partial_typing():
     assert obj.process("hello") == "Derived str: hello"
     assert obj.process(1.5) == "SubDerived float: 1.5"
     assert obj.process(1, "extra") == "Deep int, any: 1, extra"
+
+
+def test_mro_lookup_is_computed_once_per_receiver_class():
+    obj = DeepInheritancePartialTyping()
+    assert obj.process(1, "extra") == "Deep int, any: 1, extra"
+    entries = DeepInheritancePartialTyping.process.receiver_index_
+    size = len(entries)
+    index = entries[DeepInheritancePartialTyping]
+    assert [info.func_.__qualname__ for info in index.infos] == [
+        "DeepInheritancePartialTyping.process",
+        "SubDerived.process",
+        "Derived.process",
+        "Base.process",
+    ]
+    for _ in range(10):
+        assert obj.process(1.5) == "SubDerived float: 1.5"
+        assert DeepInheritancePartialTyping().process("a") == "Derived str: a"
+    assert len(entries) == size
+
+
+def test_func_info_compiles_matcher_once():
+    from strongtyping_pyoverload.class_tools import generate_parameter_infos
+    from strongtyping_pyoverload.func_info import FuncInfo
+
+    def func(a: int, *args, b: str, **kwargs):
+        pass
+
+    info = FuncInfo(func, generate_parameter_infos(func))
+    assert info.contains_args and info.contains_kwargs
+    assert not info.is_keyword_only and not info.is_positional_only
+    assert info.first_var_positional_pos == 1
+    assert info.first_var_keyword_pos == 3
+    matcher = info.matcher_
+    assert info == ((1, 2, 3), {"b": "x", "c": 4})
+    assert not info == ((1,), {"b": 2})
+    assert info.matcher_ is matcher
+
+
+def test_checkers_are_tiered_by_annotation():
+    from functools import partial
+    from typing import Any, Optional, TypedDict, Union
+
+    from strongtyping_pyoverload.func_info import build_checker
+
+    assert build_checker(Any) is None
+    assert build_checker(object) is None
+    assert build_checker(Union[int, Any]) is None
+
+    for annotation in (int, Union[int, str], int | None, Optional[str]):
+        checker = build_checker(annotation)
+        assert not isinstance(checker, partial)
+    assert build_checker(int)(True)
+    assert not build_checker(int | None)("a")
+    assert build_checker(Optional[str])(None)
+
+    class Movie(TypedDict):
+        title: str
+
+    complex_checker = build_checker(Movie)
+    assert isinstance(complex_checker, partial)
+    assert complex_checker({"title": "Alien"})
+
+
+def test_overloads_are_ranked_by_specificity():
+    from collections import abc
+    from numbers import Integral
+    from typing import Annotated, Any, Literal
+
+    from strongtyping_pyoverload.func_info import annotation_precedes, annotation_specificity
+
+    class Broad:
+        @overload
+        def handle(self, x: object):
+            return "object"
+
+        @overload
+        def handle(self, x: int | str):
+            return "union"
+
+        @overload
+        def handle(self, x: int):
+            return "int"
+
+        @overload
+        def handle(self, x: bool):
+            return "bool"
+
+    broad = Broad()
+    assert broad.handle(True) == "bool"
+    assert broad.handle(1) == "int"
+    assert broad.handle("a") == "union"
+    assert broad.handle(1.5) == "object"
+
+    def positive(x):
+        return x > 0
+
+    ranked = sorted(
+        [Any, int | str, int, Annotated[int, positive], Literal[1]],
+        key=annotation_specificity,
+    )
+    assert ranked == [Literal[1], Annotated[int, positive], int, int | str, Any]
+    # classes are only ordered by the subclass relation
+    assert annotation_precedes(list[int], list)
+    assert annotation_precedes(list, abc.Sequence)
+    assert annotation_precedes(int, Integral)
+    assert annotation_precedes(bool, Annotated[int, positive])
+    assert not annotation_precedes(abc.Sequence, list)
+    assert not annotation_precedes(list[int], int)
+    assert not annotation_precedes(int, list[int])
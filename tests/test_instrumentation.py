@@ -0,0 +1,66 @@
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload import instrumentation
+from strongtyping_pyoverload.exception import InvalidOverloadException
+
+
+class Metered:
+    @overload
+    def handle(self, x: int):
+        return "int"
+
+    @overload
+    def handle(self, x: str):
+        return "str"
+
+
+@pytest.fixture
+def events():
+    events = []
+    instrumentation.enable_instrumentation(
+        on_dispatch=lambda dispatcher, func, args, kwargs: events.append(("dispatch", args)),
+        on_miss=lambda dispatcher, args, kwargs: events.append(("miss", args)),
+        on_error=lambda dispatcher, args, kwargs, err: events.append(("error", args)),
+    )
+    yield events
+    instrumentation.disable_instrumentation()
+    instrumentation.reset_stats()
+
+
+def test_counters_and_hooks(events):
+    Metered.handle.dispatch_cache_.clear()
+    metered = Metered()
+    assert metered.handle(1) == "int"
+    assert metered.handle(2) == "int"
+    assert metered.handle("a") == "str"
+    with pytest.raises(InvalidOverloadException):
+        metered.handle(1.5)
+
+    snapshot = instrumentation.stats()[f"{__name__}.Metered.handle"]
+    assert snapshot["calls"] == 4
+    assert snapshot["cache_hits"] == 1
+    assert snapshot["candidates_checked"] == 1 + 2 + 2
+    assert snapshot["selected"] == {
+        "Metered.handle(self, x: int)": 2,
+        "Metered.handle(self, x: str)": 1,
+    }
+    assert events == [
+        ("miss", (1,)),
+        ("dispatch", (1,)),
+        ("dispatch", (2,)),
+        ("miss", ("a",)),
+        ("dispatch", ("a",)),
+        ("miss", (1.5,)),
+        ("error", (1.5,)),
+    ]
+
+
+def test_disabled_by_default():
+    class Unmetered:
+        @overload
+        def handle(self, x: int):
+            return "int"
+
+    Unmetered().handle(1)
+    assert not any(name.endswith("Unmetered.handle") for name in instrumentation.stats())
@@ -0,0 +1,82 @@
+import time
+
+from strongtyping_pyoverload import overload
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    @overload
+    def impure(self, x: int):
+        self.calls += 1
+        return self.calls
+
+    @overload(memoize=True, maxsize=2)
+    def impure(self, x: str):
+        self.calls += 1
+        return self.calls
+
+
+def test_results_are_not_memoized_by_default():
+    counter = Counter()
+    assert counter.impure(1) == 1
+    assert counter.impure(1) == 2
+
+
+def test_memoized_overload_uses_lru():
+    counter = Counter()
+    counter.impure.cache_clear()
+    assert counter.impure("a") == 1
+    assert counter.impure("a") == 1
+    assert counter.impure("b") == 2
+    assert counter.impure("c") == 3
+    # "a" was evicted by "c"
+    assert counter.impure("a") == 4
+
+    info = counter.impure.cache_info()
+    assert info.hits == 1
+    assert info.misses == 4
+    assert info.maxsize == 2
+    assert info.currsize == 2
+
+
+def test_memoized_overload_ttl():
+    class Clock:
+        @overload(memoize=True, ttl=0.01)
+        def now(self, key: str):
+            return time.monotonic()
+
+    clock = Clock()
+    first = clock.now("a")
+    assert clock.now("a") == first
+    time.sleep(0.02)
+    assert clock.now("a") != first
+
+
+def test_memoize_skips_unhashable_arguments():
+    class Summer:
+        @overload(memoize=True)
+        def total(self, values: list):
+            return sum(values)
+
+    summer = Summer()
+    assert summer.total([1, 2]) == 3
+    assert summer.total([1, 2, 3]) == 6
+    assert summer.total.cache_info().currsize == 0
+
+
+def test_memoize_distinguishes_equal_values_of_other_types():
+    class Echo:
+        @overload(memoize=True)
+        def echo(self, x: int | float):
+            return repr(x)
+
+        @overload(memoize=True)
+        def echo(self, *, key: int | float):
+            return repr(key)
+
+    echo = Echo()
+    assert [echo.echo(1), echo.echo(1.0), echo.echo(True)] == ["1", "1.0", "True"]
+    assert [echo.echo(key=1), echo.echo(key=1.0)] == ["1", "1.0"]
+    assert echo.echo.cache_info().currsize == 5
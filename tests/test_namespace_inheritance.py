@@ -48,3 +48,73 @@ def test_qualname_consistency():
     # This test checks the intent of moving to better naming
     assert hasattr(dummy, "__qualname__")
     # In a real implementation, FuncInfo would store and use __qualname__
+
+
+def make_handler(kind):
+    class Handler:
+        @overload
+        def handle(self, x: int):
+            return f"{kind} int"
+
+        @overload
+        def handle(self, x: str):
+            return f"{kind} str"
+
+    return Handler
+
+
+def test_registry_is_keyed_by_module_and_qualname():
+    from strongtyping_pyoverload.class_tools import __override_items__
+
+    from .sub_tests.nested_module import Base as NestedBase
+
+    assert (__name__, "Base", "calc") in __override_items__
+    assert (NestedBase.__module__, "Base", "process") in __override_items__
+    assert (__name__, "Base", "process") not in __override_items__
+    assert len(__override_items__[(__name__, "Derived", "calc")]) == 1
+
+
+def test_dynamic_classes_are_garbage_collected():
+    import gc
+
+    from strongtyping_pyoverload.class_tools import __override_items__
+
+    key = (__name__, "make_handler.<locals>.Handler", "handle")
+    handler_cls = make_handler("first")
+    assert handler_cls().handle(1) == "first int"
+    assert len(__override_items__[key]) == 2
+    del handler_cls
+
+    gc.collect()
+    assert key not in __override_items__
+    assert make_handler("second")().handle("a") == "second str"
+
+
+def test_subclasses_are_garbage_collected(monkeypatch):
+    import gc
+    import weakref
+
+    from strongtyping_pyoverload import class_tools
+
+    monkeypatch.setattr(class_tools, "DISPATCH_CACHE_SIZE", 8)
+
+    class Plugin:
+        @overload
+        def handle(self, x: int):
+            return "int"
+
+        @overload
+        def handle(self, x: str):
+            return "str"
+
+    refs = []
+    for idx in range(200):
+        subclass = type(f"Plugin{idx}", (Plugin,), {})
+        assert subclass().handle(idx) == "int"
+        refs.append(weakref.ref(subclass))
+    del subclass
+
+    gc.collect()
+    # only the classes still in the bounded dispatch caches are alive
+    assert sum(ref() is not None for ref in refs) <= 8
+    assert len(Plugin.handle.receiver_index_) <= 8
@@ -0,0 +1,130 @@
+import typing
+from typing import Annotated, Any
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.numpy_support import NDim, Shape
+
+np = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+
+class Numeric:
+    @overload
+    def scale(self, value: float):
+        return "scalar"
+
+    @overload
+    def scale(self, value: Annotated[npt.NDArray[np.float64], NDim(2)]):
+        return "float matrix"
+
+    @overload
+    def scale(self, value: npt.NDArray[np.float64]):
+        return "float array"
+
+    @overload
+    def scale(self, value: npt.NDArray[np.integer[Any]]):
+        return "int array"
+
+    @overload
+    def scale(self, value: Annotated[np.ndarray, Shape(None, 3)]):
+        return "three columns"
+
+
+def test_dispatch_on_dtype_and_ndim():
+    numeric = Numeric()
+    assert numeric.scale(1.5) == "scalar"
+    assert numeric.scale(np.zeros((2, 2))) == "float matrix"
+    assert numeric.scale(np.zeros(3)) == "float array"
+    assert numeric.scale(np.arange(3, dtype=np.int32)) == "int array"
+    assert numeric.scale(np.zeros((4, 3), dtype=np.complex64)) == "three columns"
+    # arrays are decided per call, scalars stay cached by type
+    assert set(Numeric.scale.dispatch_cache_) == {(Numeric, float)}
+
+
+def test_elements_are_not_checked():
+    class Strict:
+        @overload
+        def take(self, value: npt.NDArray[np.float64]):
+            return value
+
+    array = np.zeros(1_000_000, dtype=np.float64)
+    assert Strict().take(array) is array
+
+
+def test_fixed_shape_annotation():
+    class Fixed:
+        @overload
+        def take(self, value: np.ndarray[tuple[int, int], np.dtype[np.float64]]):
+            return "matrix"
+
+        @overload
+        def take(self, value: np.ndarray):
+            return "array"
+
+    assert Fixed().take(np.zeros((2, 2))) == "matrix"
+    assert Fixed().take(np.zeros(2)) == "array"
+
+
+def test_markers():
+    assert NDim(2) == NDim(2)
+    assert Shape(None, 3) == Shape(None, 3)
+    assert repr(Shape(None, 3)) == "Shape(None, 3)"
+    assert Shape(2, None)(np.zeros((2, 5)))
+    assert not Shape(2, None)(np.zeros((3, 5)))
+    assert not NDim(1)(np.zeros((2, 5)))
+
+
+def test_any_dtype():
+    class Loose:
+        @overload
+        def take(self, value: npt.NDArray[Any]):
+            return "ndarray"
+
+        @overload
+        def take(self, value: int):
+            return "int"
+
+    class Looser:
+        @overload
+        def take(self, value: np.ndarray[Any, Any]):
+            return "ndarray"
+
+    assert Loose().take(np.zeros(3)) == "ndarray"
+    assert Loose().take(np.arange(3)) == "ndarray"
+    assert Loose().take(1) == "int"
+    assert Looser().take(np.zeros((2, 2), dtype=np.complex64)) == "ndarray"
+
+
+@pytest.mark.skipif(not hasattr(typing, "TypeAliasType"), reason="needs Python >= 3.12")
+def test_type_alias_annotations():
+    # `npt.NDArray` is defined like this since NumPy 2.3
+    scalar_type = typing.TypeVar("scalar_type", bound=np.generic)
+    Array = typing.TypeAliasType(
+        "Array", np.ndarray[tuple[Any, ...], np.dtype[scalar_type]], type_params=(scalar_type,)
+    )
+
+    class Aliased:
+        @overload
+        def take(self, value: Annotated[Array[np.float64], NDim(2)]):
+            return "float matrix"
+
+        @overload
+        def take(self, value: Array[np.float64]):
+            return "float array"
+
+        @overload
+        def take(self, value: Array):
+            return "array"
+
+        @overload
+        def take(self, value: float):
+            return "float"
+
+    aliased = Aliased()
+    assert aliased.take(np.zeros((2, 2))) == "float matrix"
+    assert aliased.take(np.zeros(2)) == "float array"
+    assert aliased.take(np.arange(2)) == "array"
+    assert aliased.take(1.5) == "float"
+    assert set(Aliased.take.dispatch_cache_) == {(Aliased, float)}
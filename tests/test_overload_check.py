@@ -0,0 +1,184 @@
+from collections import abc
+from numbers import Integral, Number
+from typing import Any
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import OverloadConflictException, OverloadConflictWarning
+from strongtyping_pyoverload.overload_check import get_overload_check, set_overload_check
+
+
+@pytest.fixture
+def strict():
+    mode = get_overload_check()
+    set_overload_check("raise")
+    yield
+    set_overload_check(mode)
+
+
+def test_duplicate_overload_warns():
+    with pytest.warns(OverloadConflictWarning, match="duplicates"):
+
+        class Duplicate:
+            @overload
+            def handle(self, x: int, y: Any):
+                return 1
+
+            @overload
+            def handle(self, x: int, y):
+                return 2
+
+
+def test_unreachable_overload_warns():
+    with pytest.warns(OverloadConflictWarning, match="unreachable"):
+
+        class Shadowed:
+            @overload
+            def handle(self, x: Number):
+                return "number"
+
+            @overload
+            def handle(self, x: int | float):
+                return "int or float"
+
+
+def test_subclasses_are_tried_before_abstract_bases(strict):
+    class Concrete:
+        @overload
+        def handle(self, x: list):
+            return "list"
+
+        @overload
+        def handle(self, x: abc.Sequence):
+            return "sequence"
+
+        @overload
+        def handle(self, x: int):
+            return "int"
+
+        @overload
+        def handle(self, x: Integral):
+            return "integral"
+
+    class Abstract:
+        @overload
+        def handle(self, x: abc.Sequence):
+            return "sequence"
+
+        @overload
+        def handle(self, x: list):
+            return "list"
+
+    assert Concrete().handle([1]) == "list"
+    assert Concrete().handle((1,)) == "sequence"
+    assert Concrete().handle(1) == "int"
+    assert Concrete().handle(True) == "int"
+    assert Abstract().handle([1]) == "list"
+    assert Abstract().handle("a") == "sequence"
+
+
+def test_ambiguous_overloads_raise_in_strict_mode(strict):
+    with pytest.raises(OverloadConflictException, match="ambiguous"):
+
+        class Ambiguous:
+            @overload
+            def handle(self, x: int, y: object):
+                return 1
+
+            @overload
+            def handle(self, x: object, y: int):
+                return 2
+
+
+def test_overlapping_unions_raise_in_strict_mode(strict):
+    with pytest.raises(OverloadConflictException, match="ambiguous"):
+
+        class Overlapping:
+            @overload
+            def handle(self, x: int | str):
+                return 1
+
+            @overload
+            def handle(self, x: str | bytes):
+                return 2
+
+    class Disjoint:
+        @overload
+        def handle(self, x: int | str, y: int):
+            return 1
+
+        @overload
+        def handle(self, x: str | bytes, y: str):
+            return 2
+
+    assert Disjoint().handle("a", "b") == 2
+
+
+def test_deferred_checks_warn_at_the_call():
+    class Lazy:
+        @overload(lazy=True)
+        def handle(self, x: int):
+            return 1
+
+        @overload(lazy=True)
+        def handle(self, x: int):
+            return 2
+
+    with pytest.warns(OverloadConflictWarning, match="duplicates") as record:
+        Lazy().handle(1)
+    assert record[0].filename == __file__
+
+
+def test_distinct_overloads_pass(strict):
+    class Distinct:
+        @overload
+        def handle(self, x: int):
+            return "int"
+
+        @overload
+        def handle(self, x: bool):
+            return "bool"
+
+        @overload
+        def handle(self, x: int, y: int):
+            return "pair"
+
+        @overload
+        def handle(self, x: list[int]):
+            return "list"
+
+    assert Distinct().handle(True) == "bool"
+
+
+def test_lazy_overloads_are_checked_on_first_dispatch(strict):
+    class Lazy:
+        @overload(lazy=True)
+        def handle(self, x: int):
+            return 1
+
+        @overload(lazy=True)
+        def handle(self, x: int):
+            return 2
+
+    with pytest.raises(OverloadConflictException, match="duplicates"):
+        Lazy().handle(1)
+
+
+class Forward:
+    @overload
+    def handle(self, x: "Later", y: object):
+        return 1
+
+    @overload
+    def handle(self, x: object, y: "Later"):
+        return 2
+
+
+class Later:
+    pass
+
+
+def test_forward_references_are_checked_once_resolved(strict):
+    with pytest.raises(OverloadConflictException, match="ambiguous"):
+        Forward().handle(Later(), 1)
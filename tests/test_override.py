@@ -70,6 +70,12 @@ def test_with_kwargs():
     assert example.my_func(2, c=3, b=4) == 24
 
 
+def test_with_falsy_kwargs():
+    example = Example()
+    assert example.my_func(other_val=0, val=2) == 1
+    assert example.my_func(0, b=0) == 0
+
+
 def test_with_pos_only():
     example = Example()
     assert example.my_func([1, 2, 3], 2) == [2, 4, 6]
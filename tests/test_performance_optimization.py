@@ -1,6 +1,8 @@
 import time
+from typing import Annotated
 import pytest
 from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import InvalidOverloadException
 
 class HeavyService:
     @overload
@@ -59,3 +61,238 @@ def test_registry_efficiency():
     for i in range(10):
         service.compute(i)
         service.compute(str(i))
+
+
+class ExpensiveRepr:
+    repr_calls = 0
+
+    def __repr__(self):
+        ExpensiveRepr.repr_calls += 1
+        return "ExpensiveRepr()"
+
+
+class ReprService:
+    @overload
+    def handle(self, x: ExpensiveRepr):
+        return "expensive"
+
+    @overload
+    def handle(self, x: int):
+        return "int"
+
+
+def test_dispatch_never_reprs_arguments():
+    service = ReprService()
+    for _ in range(10):
+        assert service.handle(ExpensiveRepr()) == "expensive"
+    assert ExpensiveRepr.repr_calls == 0
+
+
+def test_dispatch_cache_is_keyed_on_types():
+    service = HeavyService()
+    service.compute(1)
+    service.compute("a")
+    dispatch_cache = HeavyService.compute.dispatch_cache_
+    size = len(dispatch_cache)
+    for i in range(50):
+        assert service.compute(i) == i * i
+        assert service.compute(str(i)) == str(i).upper()
+    assert len(dispatch_cache) == size
+
+
+def test_overload_index_only_yields_compatible_shapes():
+    from strongtyping_pyoverload.class_tools import generate_parameter_infos
+    from strongtyping_pyoverload.func_info import FuncInfo
+    from strongtyping_pyoverload.overload_index import OverloadIndex
+
+    def one(a: int): ...
+    def two(a: int, b: int): ...
+    def default(a: int, *, b: int = 0): ...
+    def var(*args, **kwargs): ...
+
+    infos = [FuncInfo(func, generate_parameter_infos(func)) for func in (one, two, default, var)]
+    index = OverloadIndex(infos)
+    assert [info.func_ for info in index.candidates(1, {})] == [one, default, var]
+    assert [info.func_ for info in index.candidates(2, {})] == [two, var]
+    assert [info.func_ for info in index.candidates(1, {"b": 1})] == [two, default, var]
+    assert [info.func_ for info in index.candidates(0, {"c": 1})] == [var]
+
+
+def test_call_shapes_are_bounded():
+    from strongtyping_pyoverload.overload_index import CALL_SHAPE_CACHE_SIZE
+
+    class Options:
+        @overload
+        def configure(self, **kwargs):
+            return len(kwargs)
+
+    options = Options()
+    for idx in range(CALL_SHAPE_CACHE_SIZE * 3):
+        assert options.configure(**{f"key{idx}": idx}) == 1
+    index = Options.configure.receiver_index(Options)
+    assert len(index._by_call_shape) <= CALL_SHAPE_CACHE_SIZE
+
+
+def test_dispatch_cache_distinguishes_keyword_types():
+    class KeywordService:
+        @overload
+        def handle(self, *, value: int):
+            return "int"
+
+        @overload
+        def handle(self, *, value: str):
+            return "str"
+
+    service = KeywordService()
+    assert service.handle(value=1) == "int"
+    assert service.handle(value="a") == "str"
+
+
+def test_warmup_primes_dispatch_cache():
+    class WarmService(HeavyService):
+        pass
+
+    service = WarmService()
+    assert service.compute.warmup(int) == 1
+    assert (WarmService, int) in HeavyService.compute.dispatch_cache_
+    with pytest.raises(InvalidOverloadException):
+        service.compute.warmup(float)
+
+
+def test_prime_resolves_annotated_signatures():
+    from strongtyping_pyoverload import prime
+
+    class Primed:
+        @overload
+        def handle(self, value: int | None, *, flag: bool):
+            return "scalar"
+
+        @overload
+        def handle(self, value: list[int]):
+            return "list"
+
+    class PrimedChild(Primed):
+        @overload
+        def handle(self, value: bytes):
+            return "bytes"
+
+    assert prime(PrimedChild) == 3
+    assert set(PrimedChild.handle.dispatch_cache_) == {
+        (PrimedChild, bytes),
+        (PrimedChild, int, ("flag", bool)),
+        (PrimedChild, type(None), ("flag", bool)),
+    }
+    assert PrimedChild().handle(None, flag=True) == "scalar"
+
+
+class Transformer:
+    def __init__(self):
+        self.batches = []
+
+    @overload
+    def transform(self, value: int):
+        return value * 2
+
+    @overload
+    def transform(self, value: str):
+        return value.upper()
+
+    @overload
+    def transform(self, values: list[int]):
+        self.batches.append(values)
+        return [value * 2 for value in values]
+
+
+def test_map_groups_by_type():
+    transformer = Transformer()
+    items = [1, "a", 2, True, "b"]
+    expected = [2, "A", 4, 2, "B"]
+    assert transformer.transform.map(items) == expected
+    assert list(transformer.transform.imap(iter(items))) == expected
+    assert transformer.transform.map(items, ordered=False) == [2, 4, "A", "B", 2]
+    assert Transformer.transform.map(transformer, [3]) == [6]
+    assert set(Transformer.transform.dispatch_cache_) == {
+        (Transformer, int),
+        (Transformer, str),
+        (Transformer, bool),
+    }
+    assert transformer.batches == []
+
+
+def test_map_decided_per_value():
+    class Signs:
+        @overload
+        def sign(self, value: Annotated[float, lambda val: val < 0]):
+            return "negative"
+
+        @overload
+        def sign(self, value: float):
+            return "positive"
+
+    items = [-1.5, 1.5, -2.0]
+    assert Signs().sign.map(items) == ["negative", "positive", "negative"]
+    assert list(Signs().sign.imap(items)) == ["negative", "positive", "negative"]
+    assert not Signs.sign.dispatch_cache_
+
+
+def test_map_batch():
+    transformer = Transformer()
+    assert transformer.transform.map([1, "a", 2], batch=True) == [2, "A", 4]
+    assert transformer.batches == [[1, 2]]
+
+
+def test_map_batch_without_batch_overload_formats_nothing():
+    class Item:
+        reprs = 0
+
+        def __repr__(self):
+            Item.reprs += 1
+            return "Item()"
+
+    class Handler:
+        @overload
+        def handle(self, value: Item):
+            return 1
+
+        @overload
+        def handle(self, values: list[int]):
+            return [0] * len(values)
+
+    assert Handler().handle.map([Item() for _ in range(100)], batch=True) == [1] * 100
+    assert Item.reprs == 0
+
+
+def test_map_without_match():
+    transformer = Transformer()
+    with pytest.raises(InvalidOverloadException):
+        transformer.transform.map([1, b"a"])
+    with pytest.raises(InvalidOverloadException):
+        list(transformer.transform.imap([b"a"]))
+
+
+def test_value_dependent_overloads_only_affect_their_types():
+    class Mixed:
+        @overload
+        def run(self, value: Annotated[float, lambda val: val < 0]):
+            return "negative"
+
+        @overload
+        def run(self, value: list[str]):
+            return "strings"
+
+        @overload
+        def run(self, value: int):
+            return "int"
+
+        @overload
+        def run(self, value: float):
+            return "float"
+
+    mixed = Mixed()
+    assert mixed.run(1) == "int"
+    assert mixed.run(1.5) == "float"
+    assert mixed.run(["a"]) == "strings"
+    # ruled out by type for `int`, decided per value for `float` and `list`
+    assert set(Mixed.run.dispatch_cache_) == {(Mixed, int)}
+    assert Mixed.run.warmup(int) == 1
+    assert Mixed.run.warmup() == 1
@@ -0,0 +1,67 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import InvalidOverloadException
+
+
+@overload
+def square(x: int):
+    return x * x
+
+
+@overload
+def square(x: str):
+    return x * 2
+
+
+class Transform:
+    def __init__(self, factor: int = 2):
+        self.factor = factor
+
+    @overload
+    def apply(self, x: int):
+        return x * self.factor
+
+    @overload
+    def apply(self, x: str):
+        return x.upper()
+
+
+class ChildTransform(Transform):
+    @overload
+    def apply(self, x: float):
+        return -x
+
+
+def test_pickle_by_reference():
+    assert pickle.loads(pickle.dumps(square)) is square
+    assert pickle.loads(pickle.dumps(Transform.apply)) is Transform.apply
+    bound = pickle.loads(pickle.dumps(Transform(3).apply))
+    assert bound.__func__ is Transform.apply
+    assert bound(2) == 6
+
+
+def test_parallel_map_threads():
+    items = [1, "a", 2, "b", 3]
+    with ThreadPoolExecutor(2) as executor:
+        assert square.parallel_map(items, executor=executor, chunksize=1) == [1, "aa", 4, "bb", 9]
+        assert Transform().apply.parallel_map(items, executor=executor) == [2, "A", 4, "B", 6]
+        assert ChildTransform().apply.parallel_map([1.5, 1], executor=executor) == [-1.5, 2]
+        assert square.parallel_map(items, executor=executor, ordered=False) == [1, 4, 9, "aa", "bb"]
+        with pytest.raises(InvalidOverloadException):
+            square.parallel_map([1, b"a"], executor=executor)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method"
+)
+def test_parallel_map_processes():
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        results = Transform(3).apply.parallel_map(range(6), executor=executor, chunksize=2)
+        assert results == [0, 3, 6, 9, 12, 15]
+        assert square.parallel_map([2, "x"], executor=executor) == [4, "xx"]
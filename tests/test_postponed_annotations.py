@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from strongtyping_pyoverload import overload
+from strongtyping_pyoverload.exception import InvalidOverloadException
+
+
+class Vector:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    @overload
+    def scale(self, other: Vector):
+        return Vector(self.x * other.x, self.y * other.y)
+
+    @overload
+    def scale(self, factor: int):
+        return Vector(self.x * factor, self.y * factor)
+
+    @overload
+    def scale(self, point: Point):
+        return Vector(self.x * point.value, self.y * point.value)
+
+
+class Point:
+    def __init__(self, value: int):
+        self.value = value
+
+
+def test_string_annotations_are_resolved():
+    vector = Vector(1, 2)
+    assert vector.scale(3).x == 3
+    assert vector.scale(Vector(2, 3)).y == 6
+    assert all(
+        not isinstance(param[0], str) for info in Vector.scale.overloads_ for param in info.params_
+    )
+
+
+def test_forward_reference_resolved_on_dispatch():
+    # `Point` was not defined yet when the overload was registered
+    assert Vector(1, 2).scale(Point(5)).y == 10
+    assert all(info.annotations_resolved_ for info in Vector.scale.overloads_)
+    assert (Vector, Point) in Vector.scale.dispatch_cache_
+
+
+def test_annotations_resolved_in_class_namespace():
+    # a local class isn't in the module globals `typing.get_type_hints` looks in
+    class Node:
+        @overload
+        def merge(self, other: Node):
+            return "node"
+
+        @overload
+        def merge(self, other: int):
+            return "int"
+
+    assert Node().merge(Node()) == "node"
+    assert Node().merge(1) == "int"
+    assert all(info.annotations_resolved_ for info in Node.merge.overloads_)
+
+
+def test_unresolvable_annotations_are_retried_once_a_name_was_defined(monkeypatch):
+    class Handler:
+        @overload
+        def handle(self, value: int):
+            return "int"
+
+        @overload
+        def handle(self, value: Missing):  # noqa: F821
+            return "missing"
+
+    attempts = []
+    get_type_hints = typing.get_type_hints
+
+    def counting_get_type_hints(obj, *args, **kwargs):
+        attempts.append(obj)
+        return get_type_hints(obj, *args, **kwargs)
+
+    monkeypatch.setattr(typing, "get_type_hints", counting_get_type_hints)
+    handler = Handler()
+    for _ in range(10):
+        assert handler.handle(1) == "int"
+    # once after the class was created, not on every call
+    assert len(attempts) == 1
+    with pytest.raises(InvalidOverloadException):
+        handler.handle(Vector(1, 2))
+
+    monkeypatch.setitem(globals(), "Missing", Vector)
+    assert handler.handle(Vector(1, 2)) == "missing"
+    assert len(attempts) == 2
@@ -68,3 +68,46 @@ def test_complex_pydantic_dispatching():
     # and it is defined in the subclass, which usually takes precedence if it matches.
     assert handler.process({"name": "Alice", "age": 30}) == "Created user Alice with priority 0"
     assert handler.process({"id": 1, "name": "Bob"}) == "Updated user 1"
+
+class MixedHandler:
+    @overload
+    def process(self, data: UserCreateSchema, count: int):
+        return f"{data.name} x{count}"
+
+    @overload
+    def process(self, data: dict, count: str):
+        return f"dict {count}"
+
+def test_pydantic_checks_remaining_parameters():
+    handler = MixedHandler()
+    assert handler.process({"name": "Alice", "age": 30}, 2) == "Alice x2"
+    assert handler.process({"name": "Alice", "age": 30}, "2") == "dict 2"
+
+def test_pydantic_dispatch_keeps_no_state():
+    from concurrent.futures import ThreadPoolExecutor
+
+    handler = DataHandler()
+
+    def call(idx):
+        return handler.process({"id": idx})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(call, range(200)))
+    assert results == [f"Updated user {idx}" for idx in range(200)]
+
+def test_pydantic_precheck_skips_implausible_validation(monkeypatch):
+    calls = []
+    original = UserCreateSchema.model_validate.__func__
+
+    def model_validate(cls, obj, *args, **kwargs):
+        calls.append(obj)
+        return original(cls, obj, *args, **kwargs)
+
+    monkeypatch.setattr(UserCreateSchema, "model_validate", classmethod(model_validate))
+    handler = DataHandler()
+    assert handler.process({"id": 1}) == "Updated user 1"
+    assert handler.process({"something": "else"}) == "Processed dict"
+    assert handler.process(UserCreateSchema(name="Dora", age=3)) == "Created user Dora"
+    assert calls == []
+    assert handler.process({"name": "Alice", "age": "x"}) == "Processed dict"
+    assert calls == [{"name": "Alice", "age": "x"}]